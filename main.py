@@ -3,32 +3,43 @@ from src.data.repository import KnowledgeRepository
 from src.data.sample_generator import generate_sample_data
 from src.rag.core import EnhancedRAGSystem
 from src.llm.service import LLMService
+from src.rag.embeddings.models import EmbeddingModel, create_embedding_model
 from src.ui.app import create_app
 import streamlit as st
+import logging
 import os
 
+logger = logging.getLogger("liveops")
+
+# Only immutable resources are cached once per server process. The repository
+# is a cache_resource rather than cache_data so it is not pickled and copied on
+# every rerun, and so every session's RAG system points at the same object.
+@st.cache_resource
+def get_repo(num_changes: int = 100) -> KnowledgeRepository:
+    logger.info("Generating sample data...")
+    repo = generate_sample_data(num_changes)
+    logger.info("Generated %d changes with metrics", len(repo.changes))
+    return repo
+
+@st.cache_resource
+def get_embedding_model() -> EmbeddingModel:
+    logger.info("Loading embedding model...")
+    return create_embedding_model("local", "all-MiniLM-L6-v2")
+
 def main():
-    # Initialize session state for persistent objects
-    if 'repo' not in st.session_state:
-        print("Generating sample data...")
-        st.session_state.repo = generate_sample_data(100)
-        print(f"Generated {len(st.session_state.repo.changes)} changes with metrics")
-    
-    if 'llm_service' not in st.session_state:
-        print("Initializing LLM service...")
-        st.session_state.llm_service = LLMService()
-    
-    if 'rag' not in st.session_state:
-        print("Initializing RAG system...")
+    # The LLM service and RAG system hold per-user state (API client, usage
+    # count, response and search caches), so each session gets its own
+    if "rag" not in st.session_state:
+        logger.info("Initializing RAG system...")
         st.session_state.rag = EnhancedRAGSystem(
-            knowledge_repo=st.session_state.repo,
-            llm_service=st.session_state.llm_service,
-            config_dir="config"  # Add config directory path
+            knowledge_repo=get_repo(100),
+            llm_service=LLMService(),
+            config_dir="config",  # Add config directory path
+            embedding_model=get_embedding_model()
         )
     
-    # Use the persistent objects from session state
-    print("Starting application...")
     create_app(st.session_state.rag)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
     main()
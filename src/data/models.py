@@ -1,7 +1,13 @@
+import sys
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 
 class LiveOpsChange:
+    __slots__ = (
+        "change_id", "timestamp", "category", "description", "expected_impact",
+        "config_diff", "tags", "vector_embedding"
+    )
+    
     def __init__(
         self,
         change_id: str,
@@ -10,15 +16,15 @@ class LiveOpsChange:
         description: str,
         expected_impact: Dict[str, str],
         config_diff: Optional[Dict] = None,
-        tags: List[str] = []
+        tags: Optional[List[str]] = None
     ):
         self.change_id = change_id
         self.timestamp = timestamp
-        self.category = category  # e.g., "Sale", "Event", "Feature Update"
+        self.category = sys.intern(category)  # e.g., "Sale", "Event", "Feature Update"
         self.description = description
         self.expected_impact = expected_impact  # e.g., {"revenue": "increase", "retention": "neutral"}
         self.config_diff = config_diff  # Will store actual diff when available
-        self.tags = tags
+        self.tags = tuple(sys.intern(tag) for tag in tags) if tags else ()
         self.vector_embedding = None  # Will be populated by the embedding model
     
     def to_dict(self) -> Dict[str, Any]:
@@ -30,10 +36,15 @@ class LiveOpsChange:
             "description": self.description,
             "expected_impact": self.expected_impact,
             "config_diff": self.config_diff,
-            "tags": self.tags
+            "tags": list(self.tags)
         }
 
 class MetricMeasurement:
+    __slots__ = (
+        "change_id", "metric_name", "before_value", "after_value", "timestamp",
+        "time_window", "value", "percent_change"
+    )
+    
     def __init__(
         self,
         change_id: str,
@@ -41,16 +52,17 @@ class MetricMeasurement:
         before_value: float,
         after_value: float,
         timestamp: Optional[datetime] = None,
-        time_window: str = "24h"  # Time window for before/after comparison
+        time_window: str = "24h",  # Time window for before/after comparison
+        defer_percent_change: bool = False  # Leave for KnowledgeRepository.add_many() to compute in bulk
     ):
         self.change_id = change_id
-        self.metric_name = metric_name
+        self.metric_name = sys.intern(metric_name)
         self.before_value = before_value
         self.after_value = after_value
         self.timestamp = timestamp or datetime.now()
-        self.time_window = time_window
+        self.time_window = sys.intern(time_window)
         self.value = after_value  # Current value for trend analysis
-        self.percent_change = self._calculate_percent_change()
+        self.percent_change = None if defer_percent_change else self._calculate_percent_change()
         
     def _calculate_percent_change(self) -> float:
         if self.before_value == 0:
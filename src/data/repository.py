@@ -1,5 +1,9 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Mapping, Tuple
+from collections import defaultdict
 from datetime import datetime
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
 from .models import LiveOpsChange, MetricMeasurement
 
 class KnowledgeRepository:
@@ -7,23 +11,186 @@ class KnowledgeRepository:
         self.changes = []
         self.metrics = []
         
+        # Lookup indexes maintained on insert
+        self._by_category: Dict[str, List[LiveOpsChange]] = defaultdict(list)
+        self._metrics_by_change: Dict[str, List[MetricMeasurement]] = defaultdict(list)
+        self._change_positions: Dict[str, int] = {}
+        
+        # Columnar views, rebuilt lazily when the repository changes
+        self._version = 0
+        self._changes_df: Optional[pd.DataFrame] = None
+        self._changes_df_version = -1
+        self._metrics_df: Optional[pd.DataFrame] = None
+        self._metrics_df_version = -1
+        self._metric_columns: Dict[str, Dict[str, np.ndarray]] = {}
+        self._metric_columns_version = -1
+        self._metric_dicts_by_change: Dict[str, Tuple[Mapping[str, Any], ...]] = {}
+        self._metric_dicts_by_name: Dict[str, Dict[str, Mapping[str, Any]]] = {}
+        self._metric_dicts_version = -1
+        
     def add_change(self, change: LiveOpsChange):
         """Add a change to the repository."""
+        self._change_positions[change.change_id] = len(self.changes)
         self.changes.append(change)
+        self._by_category[change.category].append(change)
+        self._version += 1
         
     def add_metric(self, metric: MetricMeasurement):
         """Add a metric measurement to the repository."""
+        self._fill_percent_changes([metric])
         self.metrics.append(metric)
+        self._metrics_by_change[metric.change_id].append(metric)
+        self._version += 1
+        
+    def add_many(self, changes: List[LiveOpsChange], metrics: List[MetricMeasurement]):
+        """Add a batch of changes and metric measurements to the repository.
+        
+        Equivalent to calling ``add_change`` for every change followed by
+        ``add_metric`` for every metric, but extends the underlying lists in
+        bulk and invalidates the columnar views once. Percent changes of metrics
+        created with ``defer_percent_change=True`` are computed here in one
+        vectorized pass.
+        """
+        first_position = len(self.changes)
+        self.changes.extend(changes)
+        self._change_positions.update(
+            zip((change.change_id for change in changes), range(first_position, len(self.changes)))
+        )
+        for change in changes:
+            self._by_category[change.category].append(change)
+        
+        self._fill_percent_changes(metrics)
+        self.metrics.extend(metrics)
+        for metric in metrics:
+            self._metrics_by_change[metric.change_id].append(metric)
+        self._version += 1
+        
+    @staticmethod
+    def _fill_percent_changes(metrics: List[MetricMeasurement]):
+        """Compute the deferred percent changes of the given metrics in one vectorized pass."""
+        pending = [m for m in metrics if m.percent_change is None]
+        if not pending:
+            return
+        
+        count = len(pending)
+        before = np.fromiter((m.before_value for m in pending), dtype=np.float64, count=count)
+        after = np.fromiter((m.after_value for m in pending), dtype=np.float64, count=count)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent_change = np.where(
+                before == 0,
+                np.where(after > 0, np.inf, 0.0),
+                (after - before) / before * 100.0
+            )
+        
+        for metric, value in zip(pending, percent_change.tolist()):
+            metric.percent_change = value
+        
+    def get_metric_columns(self, metric_name: str) -> Dict[str, np.ndarray]:
+        """Get all measurements of a metric as parallel arrays.
+        
+        Args:
+            metric_name: Name of the metric
+            
+        Returns:
+            Dictionary containing:
+            - change_index: Position in ``changes`` of the change each measurement belongs to
+            - percent_change: Percent change of each measurement
+            - after_value: Value after the change of each measurement
+        """
+        if self._metric_columns_version != self._version:
+            change_indexes = defaultdict(list)
+            percent_changes = defaultdict(list)
+            after_values = defaultdict(list)
+            for metric in self.metrics:
+                position = self._change_positions.get(metric.change_id)
+                if position is not None:
+                    change_indexes[metric.metric_name].append(position)
+                    percent_changes[metric.metric_name].append(metric.percent_change)
+                    after_values[metric.metric_name].append(metric.after_value)
+            
+            self._metric_columns = {
+                name: {
+                    "change_index": np.array(change_indexes[name], dtype=np.intp),
+                    "percent_change": np.array(percent_changes[name], dtype=np.float64),
+                    "after_value": np.array(after_values[name], dtype=np.float64)
+                }
+                for name in change_indexes
+            }
+            self._metric_columns_version = self._version
+        
+        return self._metric_columns.get(metric_name, {
+            "change_index": np.empty(0, dtype=np.intp),
+            "percent_change": np.empty(0, dtype=np.float64),
+            "after_value": np.empty(0, dtype=np.float64)
+        })
+    
+    @property
+    def changes_df(self) -> pd.DataFrame:
+        """Columnar view of all changes, indexed by position in ``changes``."""
+        if self._changes_df_version != self._version:
+            self._changes_df = pd.DataFrame({
+                "change_id": [c.change_id for c in self.changes],
+                "timestamp": pd.to_datetime([c.timestamp for c in self.changes]),
+                "category": pd.Categorical([c.category for c in self.changes])
+            })
+            self._changes_df_version = self._version
+        return self._changes_df
+    
+    @property
+    def metrics_df(self) -> pd.DataFrame:
+        """Columnar view of all metric measurements, indexed by position in ``metrics``."""
+        if self._metrics_df_version != self._version:
+            self._metrics_df = pd.DataFrame({
+                "change_id": pd.Categorical([m.change_id for m in self.metrics]),
+                "metric_name": pd.Categorical([m.metric_name for m in self.metrics]),
+                "timestamp": pd.to_datetime([m.timestamp for m in self.metrics]),
+                "before_value": np.fromiter((m.before_value for m in self.metrics), dtype=np.float64, count=len(self.metrics)),
+                "after_value": np.fromiter((m.after_value for m in self.metrics), dtype=np.float64, count=len(self.metrics)),
+                "percent_change": np.fromiter((m.percent_change for m in self.metrics), dtype=np.float64, count=len(self.metrics))
+            })
+            self._metrics_df_version = self._version
+        return self._metrics_df
         
     def get_changes_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all changes in a specific category."""
-        changes = [change for change in self.changes if change.category == category]
+        changes = self._by_category.get(category, [])
         return [change.to_dict() for change in changes]
     
-    def get_metrics_for_change(self, change_id: str) -> List[Dict[str, Any]]:
-        """Get all metrics associated with a specific change."""
-        metrics = [metric for metric in self.metrics if metric.change_id == change_id]
-        return [metric.to_dict() for metric in metrics]
+    def get_metrics_for_change(self, change_id: str) -> Tuple[Mapping[str, Any], ...]:
+        """Get all metrics associated with a specific change.
+        
+        Results are memoized until the repository changes and shared between
+        callers, so they are returned as read-only mappings; copy them with
+        ``dict()`` before modifying or serializing them.
+        """
+        if self._metric_dicts_version != self._version:
+            self._metric_dicts_by_change.clear()
+            self._metric_dicts_by_name.clear()
+            self._metric_dicts_version = self._version
+        
+        metric_dicts = self._metric_dicts_by_change.get(change_id)
+        if metric_dicts is None:
+            metrics = self._metrics_by_change.get(change_id, [])
+            metric_dicts = tuple(MappingProxyType(metric.to_dict()) for metric in metrics)
+            self._metric_dicts_by_change[change_id] = metric_dicts
+        return metric_dicts
+    
+    def get_metric_for_change(self, change_id: str, metric_name: str) -> Optional[Mapping[str, Any]]:
+        """Get one named metric of a change, or None if it was not measured.
+        
+        Memoized like ``get_metrics_for_change``; if a metric was measured more
+        than once, the first measurement is returned.
+        """
+        metric_dicts = self.get_metrics_for_change(change_id)
+        
+        by_name = self._metric_dicts_by_name.get(change_id)
+        if by_name is None:
+            by_name = {}
+            for metric in metric_dicts:
+                by_name.setdefault(metric["metric_name"], metric)
+            self._metric_dicts_by_name[change_id] = by_name
+        return by_name.get(metric_name)
     
     def get_metric_history(
         self,
@@ -44,17 +211,15 @@ class KnowledgeRepository:
             - timestamps: List of measurement timestamps
             - trend_analysis: Basic trend analysis
         """
-        # Get metrics within the time range
-        metrics = [
-            m for m in self.metrics
-            if (
-                m.metric_name == metric_name and
-                start_date <= m.timestamp <= end_date
-            )
-        ]
-        
-        # Sort by timestamp
-        metrics.sort(key=lambda x: x.timestamp)
+        # Get metrics within the time range, sorted by timestamp
+        df = self.metrics_df
+        mask = (
+            (df["metric_name"] == metric_name) &
+            (df["timestamp"] >= start_date) &
+            (df["timestamp"] <= end_date)
+        )
+        positions = df.loc[mask, "timestamp"].sort_values(kind="stable").index
+        metrics = [self.metrics[i] for i in positions]
         
         # Extract values and timestamps
         values = [m.value for m in metrics]
@@ -100,12 +265,13 @@ class KnowledgeRepository:
         Returns:
             List of metric measurement dictionaries
         """
-        metrics = [m for m in self.metrics if m.metric_name == metric_name]
-        metrics.sort(key=lambda x: x.timestamp, reverse=True)
+        df = self.metrics_df
+        timestamps = df.loc[df["metric_name"] == metric_name, "timestamp"]
+        positions = timestamps.sort_values(ascending=False, kind="stable").index
         
         if limit:
-            metrics = metrics[:limit]
-        return [metric.to_dict() for metric in metrics]
+            positions = positions[:limit]
+        return [self.metrics[i].to_dict() for i in positions]
     
     def get_metrics_in_range(
         self,
@@ -121,8 +287,6 @@ class KnowledgeRepository:
         Returns:
             List of metric measurement dictionaries
         """
-        metrics = [
-            m for m in self.metrics
-            if start_date <= m.timestamp <= end_date
-        ]
-        return [metric.to_dict() for metric in metrics]
+        df = self.metrics_df
+        mask = (df["timestamp"] >= start_date) & (df["timestamp"] <= end_date)
+        return [self.metrics[i].to_dict() for i in df.index[mask]]
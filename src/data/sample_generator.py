@@ -1,558 +1,601 @@
-import random
 from datetime import datetime, timedelta
-from typing import Dict
+from string import Formatter
+from typing import List, Optional, Tuple
+import numpy as np
 from .models import LiveOpsChange, MetricMeasurement
 from .repository import KnowledgeRepository
 
-def generate_sample_data(num_changes: int = 500) -> KnowledgeRepository:
-    """Generate sample live ops changes and metrics for testing."""
-    repo = KnowledgeRepository()
-    
-    # Define categories with specific descriptions and expected impacts
-    category_templates = {
-        "Add Slot": {
-            "descriptions": [
-                "Added new '{theme}' slot to {position}",
-                "Released '{theme}' slot in {position} position",
-                "Launched new '{theme}' slot machine in {position}"
-            ],
-            "themes": [
-                "Egyptian Gold", "Lucky Dragons", "Wild West", "Mystic Fortune", 
-                "Galactic Gems", "Treasure Island", "Phoenix Rise", "Diamond Deluxe",
-                "Pirate's Bounty", "Golden Buddha", "Mermaid's Secret", "Aztec Empire"
-            ],
-            "positions": [
-                "front page", "VIP room", "featured section", "new games section",
-                "top row", "popular games", "recommended games"
-            ],
-            "impacts": {
-                "revenue": ["increase", "increase", "neutral"],
-                "dau": ["increase", "increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "increase", "neutral"],
-                "conversion_rate": ["increase", "neutral"]
-            },
-            "tags": ["New Content", "Revenue Driver", "Engagement", "Content"]
+# Range of the "before" value of each metric
+METRIC_RANGES = {
+    "revenue": (10000, 50000),
+    "dau": (10000, 100000),
+    "retention": (20, 40),
+    "session_length": (10, 30),
+    "conversion_rate": (2, 8)
+}
+
+# Common metrics across all changes
+METRICS = list(METRIC_RANGES)
+
+# Codes of expected impacts in the impact matrix; 0 means no expected impact
+IMPACT_CODES = {"increase": 1, "decrease": 2, "neutral": 3}
+IMPACT_LABELS = list(IMPACT_CODES)
+
+# Template option lists whose key is not the placeholder name plus "s"
+DESCRIPTION_OPTION_KEYS = {"old": "old_timers", "new": "new_timers"}
+
+# Range of the impact multiplier for each impact code
+IMPACT_MULTIPLIER_LOW = np.array([1.0, 1.05, 0.65, 0.97])
+IMPACT_MULTIPLIER_HIGH = np.array([1.0, 1.35, 0.95, 1.03])
+
+# Define categories with specific descriptions and expected impacts
+CATEGORY_TEMPLATES = {
+    "Add Slot": {
+        "descriptions": [
+            "Added new '{theme}' slot to {position}",
+            "Released '{theme}' slot in {position} position",
+            "Launched new '{theme}' slot machine in {position}"
+        ],
+        "themes": [
+            "Egyptian Gold", "Lucky Dragons", "Wild West", "Mystic Fortune", 
+            "Galactic Gems", "Treasure Island", "Phoenix Rise", "Diamond Deluxe",
+            "Pirate's Bounty", "Golden Buddha", "Mermaid's Secret", "Aztec Empire"
+        ],
+        "positions": [
+            "front page", "VIP room", "featured section", "new games section",
+            "top row", "popular games", "recommended games"
+        ],
+        "impacts": {
+            "revenue": ["increase", "increase", "neutral"],
+            "dau": ["increase", "increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "increase", "neutral"],
+            "conversion_rate": ["increase", "neutral"]
         },
-        "Remove Slot": {
-            "descriptions": [
-                "Removed '{theme}' slot from {position} due to {reason}",
-                "Discontinued '{theme}' slot because of {reason}",
-                "Pulled '{theme}' slot from {position} - {reason}"
-            ],
-            "themes": [
-                "Fruit Fiesta", "Space Odyssey", "Neon Nights", "Fantasy Kingdom", 
-                "Vegas Deluxe", "Thunder Cash", "Fairy Magic", "Prehistoric Giants",
-                "Cash Tornado", "Lucky Clover", "Ninja Stars", "Samurai Fortune"
-            ],
-            "positions": [
-                "front page", "VIP room", "featured section", "bottom row",
-                "popular games section", "recommended games"
-            ],
-            "reasons": [
-                "poor performance", "technical issues", "low engagement", 
-                "seasonal rotation", "licensing expiration", "content refresh",
-                "underperforming metrics", "outdated graphics"
-            ],
-            "impacts": {
-                "revenue": ["neutral", "decrease", "increase"],
-                "dau": ["neutral", "decrease"],
-                "retention": ["neutral", "decrease", "increase"],
-                "session_length": ["decrease", "neutral"],
-                "conversion_rate": ["neutral", "decrease", "increase"]
-            },
-            "tags": ["Content Removal", "Performance Optimization", "Rotation"]
+        "tags": ["New Content", "Revenue Driver", "Engagement", "Content"]
+    },
+    "Remove Slot": {
+        "descriptions": [
+            "Removed '{theme}' slot from {position} due to {reason}",
+            "Discontinued '{theme}' slot because of {reason}",
+            "Pulled '{theme}' slot from {position} - {reason}"
+        ],
+        "themes": [
+            "Fruit Fiesta", "Space Odyssey", "Neon Nights", "Fantasy Kingdom", 
+            "Vegas Deluxe", "Thunder Cash", "Fairy Magic", "Prehistoric Giants",
+            "Cash Tornado", "Lucky Clover", "Ninja Stars", "Samurai Fortune"
+        ],
+        "positions": [
+            "front page", "VIP room", "featured section", "bottom row",
+            "popular games section", "recommended games"
+        ],
+        "reasons": [
+            "poor performance", "technical issues", "low engagement", 
+            "seasonal rotation", "licensing expiration", "content refresh",
+            "underperforming metrics", "outdated graphics"
+        ],
+        "impacts": {
+            "revenue": ["neutral", "decrease", "increase"],
+            "dau": ["neutral", "decrease"],
+            "retention": ["neutral", "decrease", "increase"],
+            "session_length": ["decrease", "neutral"],
+            "conversion_rate": ["neutral", "decrease", "increase"]
         },
-        "Add Sneak Peek Slot": {
-            "descriptions": [
-                "Added sneak peek of upcoming '{theme}' slot for {duration}",
-                "Launched {duration} preview of new '{theme}' slot in {position}",
-                "Released sneak peek version of '{theme}' slot for {duration}"
-            ],
-            "themes": [
-                "Treasure Hunters", "Cosmic Clash", "Dynasty Fortune", "Magical Forest", 
-                "Ocean Riches", "Monster Bash", "Royal Gems", "Wild Safari",
-                "Mythical Creatures", "Ancient Wonders", "Space Adventure", "Golden Empire"
-            ],
-            "durations": [
-                "48 hours", "weekend", "3 days", "VIP weekend", "limited time",
-                "24 hours", "week-long", "exclusive preview"
-            ],
-            "positions": [
-                "featured section", "new games spotlight", "coming soon section",
-                "VIP room", "exclusive preview area", "special events tab"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral"],
-                "dau": ["increase", "increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["neutral", "increase"]
-            },
-            "tags": ["Preview", "Limited Time", "Engagement", "Promotion", "Upcoming Content"]
+        "tags": ["Content Removal", "Performance Optimization", "Rotation"]
+    },
+    "Add Sneak Peek Slot": {
+        "descriptions": [
+            "Added sneak peek of upcoming '{theme}' slot for {duration}",
+            "Launched {duration} preview of new '{theme}' slot in {position}",
+            "Released sneak peek version of '{theme}' slot for {duration}"
+        ],
+        "themes": [
+            "Treasure Hunters", "Cosmic Clash", "Dynasty Fortune", "Magical Forest", 
+            "Ocean Riches", "Monster Bash", "Royal Gems", "Wild Safari",
+            "Mythical Creatures", "Ancient Wonders", "Space Adventure", "Golden Empire"
+        ],
+        "durations": [
+            "48 hours", "weekend", "3 days", "VIP weekend", "limited time",
+            "24 hours", "week-long", "exclusive preview"
+        ],
+        "positions": [
+            "featured section", "new games spotlight", "coming soon section",
+            "VIP room", "exclusive preview area", "special events tab"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral"],
+            "dau": ["increase", "increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["neutral", "increase"]
         },
-        "Extend Scratcher": {
-            "descriptions": [
-                "Extended '{theme}' scratcher campaign by {duration}",
-                "Prolonged '{theme}' scratcher availability for additional {duration}",
-                "Added {duration} extension to '{theme}' scratcher promotion"
-            ],
-            "themes": [
-                "Golden Ticket", "Lucky 7s", "Cash Explosion", "Mega Millions", 
-                "Jackpot Jubilee", "Diamond Dust", "Fortune Favors", "Treasure Chest",
-                "Ruby Rush", "Sapphire Surprise", "Emerald Extravaganza", "Platinum Play"
-            ],
-            "durations": [
-                "3 days", "weekend", "1 week", "5 days", "48 hours",
-                "4 days", "limited time", "24 hours"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["neutral", "increase", "decrease"]
-            },
-            "tags": ["Extension", "Promotion", "Engagement", "Revenue Driver"]
+        "tags": ["Preview", "Limited Time", "Engagement", "Promotion", "Upcoming Content"]
+    },
+    "Extend Scratcher": {
+        "descriptions": [
+            "Extended '{theme}' scratcher campaign by {duration}",
+            "Prolonged '{theme}' scratcher availability for additional {duration}",
+            "Added {duration} extension to '{theme}' scratcher promotion"
+        ],
+        "themes": [
+            "Golden Ticket", "Lucky 7s", "Cash Explosion", "Mega Millions", 
+            "Jackpot Jubilee", "Diamond Dust", "Fortune Favors", "Treasure Chest",
+            "Ruby Rush", "Sapphire Surprise", "Emerald Extravaganza", "Platinum Play"
+        ],
+        "durations": [
+            "3 days", "weekend", "1 week", "5 days", "48 hours",
+            "4 days", "limited time", "24 hours"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["neutral", "increase", "decrease"]
         },
-        "Slot Track Positioning adjustment": {
-            "descriptions": [
-                "Moved '{theme}' slot from {old_position} to {new_position}",
-                "Adjusted position of '{theme}' slot from {old_position} to {new_position}",
-                "Repositioned '{theme}' slot to {new_position} from {old_position}"
-            ],
-            "themes": [
-                "Lucky Lions", "Golden Phoenix", "Crystal Cave", "Desert Treasure", 
-                "Arctic Fortune", "Tropical Paradise", "Mystic Moon", "Dragon's Lair",
-                "Panda Fortunes", "Viking Victory", "Pharaoh's Gold", "Aztec Adventure"
-            ],
-            "old_positions": [
-                "bottom row", "page 2", "middle section", "secondary lobby",
-                "side banner", "seasonal section", "new games", "bottom of lobby"
-            ],
-            "new_positions": [
-                "top row", "front page", "featured section", "prime placement",
-                "center position", "VIP section", "prominent position", "main lobby"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral", "decrease"],
-                "dau": ["increase", "neutral"],
-                "retention": ["neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["increase", "neutral", "decrease"]
-            },
-            "tags": ["UI Adjustment", "Visibility Change", "Optimization"]
+        "tags": ["Extension", "Promotion", "Engagement", "Revenue Driver"]
+    },
+    "Slot Track Positioning adjustment": {
+        "descriptions": [
+            "Moved '{theme}' slot from {old_position} to {new_position}",
+            "Adjusted position of '{theme}' slot from {old_position} to {new_position}",
+            "Repositioned '{theme}' slot to {new_position} from {old_position}"
+        ],
+        "themes": [
+            "Lucky Lions", "Golden Phoenix", "Crystal Cave", "Desert Treasure", 
+            "Arctic Fortune", "Tropical Paradise", "Mystic Moon", "Dragon's Lair",
+            "Panda Fortunes", "Viking Victory", "Pharaoh's Gold", "Aztec Adventure"
+        ],
+        "old_positions": [
+            "bottom row", "page 2", "middle section", "secondary lobby",
+            "side banner", "seasonal section", "new games", "bottom of lobby"
+        ],
+        "new_positions": [
+            "top row", "front page", "featured section", "prime placement",
+            "center position", "VIP section", "prominent position", "main lobby"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral", "decrease"],
+            "dau": ["increase", "neutral"],
+            "retention": ["neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["increase", "neutral", "decrease"]
         },
-        "Cooldown adjustments": {
-            "descriptions": [
-                "Reduced cooldown on {feature} from {old} to {new}",
-                "Increased cooldown period for {feature} from {old} to {new}",
-                "Adjusted {feature} cooldown timer to {new} from {old}"
-            ],
-            "features": [
-                "daily bonuses", "hourly rewards", "free spins", "gift requests", 
-                "friend bonuses", "mystery boxes", "challenge rewards", "VIP perks",
-                "wheel spins", "collector's bonus", "streak rewards", "mini-games"
-            ],
-            "old_timers": [
-                "24 hours", "4 hours", "12 hours", "30 minutes", 
-                "6 hours", "8 hours", "2 hours", "48 hours"
-            ],
-            "new_timers": [
-                "12 hours", "2 hours", "6 hours", "15 minutes", 
-                "4 hours", "24 hours", "1 hour", "3 hours"
-            ],
-            "impacts": {
-                "revenue": ["increase", "decrease", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "decrease", "neutral"],
-                "conversion_rate": ["neutral", "decrease", "increase"]
-            },
-            "tags": ["Game Balance", "Engagement", "Retention", "Session Frequency"]
+        "tags": ["UI Adjustment", "Visibility Change", "Optimization"]
+    },
+    "Cooldown adjustments": {
+        "descriptions": [
+            "Reduced cooldown on {feature} from {old} to {new}",
+            "Increased cooldown period for {feature} from {old} to {new}",
+            "Adjusted {feature} cooldown timer to {new} from {old}"
+        ],
+        "features": [
+            "daily bonuses", "hourly rewards", "free spins", "gift requests", 
+            "friend bonuses", "mystery boxes", "challenge rewards", "VIP perks",
+            "wheel spins", "collector's bonus", "streak rewards", "mini-games"
+        ],
+        "old_timers": [
+            "24 hours", "4 hours", "12 hours", "30 minutes", 
+            "6 hours", "8 hours", "2 hours", "48 hours"
+        ],
+        "new_timers": [
+            "12 hours", "2 hours", "6 hours", "15 minutes", 
+            "4 hours", "24 hours", "1 hour", "3 hours"
+        ],
+        "impacts": {
+            "revenue": ["increase", "decrease", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "decrease", "neutral"],
+            "conversion_rate": ["neutral", "decrease", "increase"]
         },
-        "Purchase Quests": {
-            "descriptions": [
-                "Added new '{theme}' purchase quest with {reward} reward",
-                "Launched '{theme}' spending quest offering {reward}",
-                "Implemented new purchase milestone quest: '{theme}' with {reward}"
-            ],
-            "themes": [
-                "Summer Splash", "Treasure Hunter", "VIP Elite", "Whale's Journey", 
-                "High Roller", "Jackpot Chase", "Big Spender", "Fortune Seeker",
-                "Diamond Club", "Royal Flush", "Platinum Path", "Golden Opportunity"
-            ],
-            "rewards": [
-                "exclusive avatar", "rare collection item", "VIP status boost", 
-                "bonus multiplier", "unique profile frame", "special badge",
-                "limited edition item", "bonus spins package", "premium currency"
-            ],
-            "impacts": {
-                "revenue": ["increase", "increase", "neutral"],
-                "dau": ["neutral", "increase"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["increase", "neutral"]
-            },
-            "tags": ["Monetization", "Engagement", "Reward System", "VIP", "Progression"]
+        "tags": ["Game Balance", "Engagement", "Retention", "Session Frequency"]
+    },
+    "Purchase Quests": {
+        "descriptions": [
+            "Added new '{theme}' purchase quest with {reward} reward",
+            "Launched '{theme}' spending quest offering {reward}",
+            "Implemented new purchase milestone quest: '{theme}' with {reward}"
+        ],
+        "themes": [
+            "Summer Splash", "Treasure Hunter", "VIP Elite", "Whale's Journey", 
+            "High Roller", "Jackpot Chase", "Big Spender", "Fortune Seeker",
+            "Diamond Club", "Royal Flush", "Platinum Path", "Golden Opportunity"
+        ],
+        "rewards": [
+            "exclusive avatar", "rare collection item", "VIP status boost", 
+            "bonus multiplier", "unique profile frame", "special badge",
+            "limited edition item", "bonus spins package", "premium currency"
+        ],
+        "impacts": {
+            "revenue": ["increase", "increase", "neutral"],
+            "dau": ["neutral", "increase"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["increase", "neutral"]
         },
-        "Test Configurations": {
-            "descriptions": [
-                "Tested variant {variant} of {feature} for {segment}",
-                "A/B testing {feature} configuration {variant} with {segment}",
-                "Experimental {feature} settings (variant {variant}) for {segment}"
-            ],
-            "features": [
-                "first purchase offer", "tutorial flow", "bonus structure", "UI layout", 
-                "reward distribution", "progression curve", "pricing model", "payout frequency",
-                "win celebration", "loyalty rewards", "daily challenges", "store layout"
-            ],
-            "variants": ["A", "B", "C", "D", "2.1", "3.5", "X", "beta"],
-            "segments": [
-                "new users", "7-day retention cohort", "non-spenders", "lapsed players", 
-                "high rollers", "casual players", "weekend players", "returning users",
-                "Android users", "iOS users", "mid-tier spenders", "social players"
-            ],
-            "impacts": {
-                "revenue": ["neutral", "increase", "decrease"],
-                "dau": ["neutral", "increase", "decrease"],
-                "retention": ["neutral", "increase", "decrease"],
-                "session_length": ["neutral", "increase", "decrease"],
-                "conversion_rate": ["neutral", "increase", "decrease"]
-            },
-            "tags": ["Test", "Experiment", "Optimization", "A/B Test", "Data-Driven"]
+        "tags": ["Monetization", "Engagement", "Reward System", "VIP", "Progression"]
+    },
+    "Test Configurations": {
+        "descriptions": [
+            "Tested variant {variant} of {feature} for {segment}",
+            "A/B testing {feature} configuration {variant} with {segment}",
+            "Experimental {feature} settings (variant {variant}) for {segment}"
+        ],
+        "features": [
+            "first purchase offer", "tutorial flow", "bonus structure", "UI layout", 
+            "reward distribution", "progression curve", "pricing model", "payout frequency",
+            "win celebration", "loyalty rewards", "daily challenges", "store layout"
+        ],
+        "variants": ["A", "B", "C", "D", "2.1", "3.5", "X", "beta"],
+        "segments": [
+            "new users", "7-day retention cohort", "non-spenders", "lapsed players", 
+            "high rollers", "casual players", "weekend players", "returning users",
+            "Android users", "iOS users", "mid-tier spenders", "social players"
+        ],
+        "impacts": {
+            "revenue": ["neutral", "increase", "decrease"],
+            "dau": ["neutral", "increase", "decrease"],
+            "retention": ["neutral", "increase", "decrease"],
+            "session_length": ["neutral", "increase", "decrease"],
+            "conversion_rate": ["neutral", "increase", "decrease"]
         },
-        "Sale Themes": {
-            "descriptions": [
-                "Launched {holiday} themed sale with {discount} off",
-                "Released special {holiday} sale offering {discount} discount",
-                "Implemented {holiday} themed store promotion with {discount}"
-            ],
-            "holidays": [
-                "Valentine's Day", "Halloween", "Christmas", "New Year", 
-                "Thanksgiving", "Summer", "Spring", "Anniversary",
-                "Black Friday", "Cyber Monday", "Easter", "Independence Day"
-            ],
-            "discounts": [
-                "50%", "buy one get one free", "2x value", "30%", 
-                "70%", "3x bonus", "40%", "special bundle",
-                "progressive discount", "tiered rewards", "25%", "60%"
-            ],
-            "impacts": {
-                "revenue": ["increase", "increase", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["increase", "increase", "neutral"]
-            },
-            "tags": ["Sale", "Promotion", "Seasonal", "Limited Time", "Monetization"]
+        "tags": ["Test", "Experiment", "Optimization", "A/B Test", "Data-Driven"]
+    },
+    "Sale Themes": {
+        "descriptions": [
+            "Launched {holiday} themed sale with {discount} off",
+            "Released special {holiday} sale offering {discount} discount",
+            "Implemented {holiday} themed store promotion with {discount}"
+        ],
+        "holidays": [
+            "Valentine's Day", "Halloween", "Christmas", "New Year", 
+            "Thanksgiving", "Summer", "Spring", "Anniversary",
+            "Black Friday", "Cyber Monday", "Easter", "Independence Day"
+        ],
+        "discounts": [
+            "50%", "buy one get one free", "2x value", "30%", 
+            "70%", "3x bonus", "40%", "special bundle",
+            "progressive discount", "tiered rewards", "25%", "60%"
+        ],
+        "impacts": {
+            "revenue": ["increase", "increase", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["increase", "increase", "neutral"]
         },
-        "RYD Multiplier": {
-            "descriptions": [
-                "Increased Roll Your Dice multiplier to {multiplier}x for {duration}",
-                "Special {multiplier}x multiplier for Roll Your Dice event lasting {duration}",
-                "Roll Your Dice bonus multiplier: {multiplier}x for {duration}"
-            ],
-            "multipliers": ["2", "3", "4", "5", "2.5", "1.5", "3.5", "10"],
-            "durations": [
-                "weekend", "24 hours", "48 hours", "3 days", 
-                "limited time", "special event", "day-long", "holiday period"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["increase", "neutral"]
-            },
-            "tags": ["Event", "Promotion", "Engagement", "Limited Time", "Special Feature"]
+        "tags": ["Sale", "Promotion", "Seasonal", "Limited Time", "Monetization"]
+    },
+    "RYD Multiplier": {
+        "descriptions": [
+            "Increased Roll Your Dice multiplier to {multiplier}x for {duration}",
+            "Special {multiplier}x multiplier for Roll Your Dice event lasting {duration}",
+            "Roll Your Dice bonus multiplier: {multiplier}x for {duration}"
+        ],
+        "multipliers": ["2", "3", "4", "5", "2.5", "1.5", "3.5", "10"],
+        "durations": [
+            "weekend", "24 hours", "48 hours", "3 days", 
+            "limited time", "special event", "day-long", "holiday period"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["increase", "neutral"]
         },
-        "Run Trident Trials": {
-            "descriptions": [
-                "Launched Trident Trials event with {theme} theme for {duration}",
-                "Started {theme} Trident Trials tournament running for {duration}",
-                "Released special {theme} edition of Trident Trials for {duration}"
-            ],
-            "themes": [
-                "Deep Sea", "Neptune's Wrath", "Ocean's Bounty", "Atlantis", 
-                "Pirates' Revenge", "Kraken's Lair", "Mermaid's Grotto", "Poseidon's Realm",
-                "Coral Kingdom", "Sunken Treasure", "Mythical Waters", "Sea Monster"
-            ],
-            "durations": [
-                "weekend", "7 days", "5 days", "3 days", 
-                "limited time", "2 weeks", "special period", "extended weekend"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral"],
-                "dau": ["increase", "increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "increase", "neutral"],
-                "conversion_rate": ["neutral", "increase"]
-            },
-            "tags": ["Tournament", "Event", "Engagement", "Competition", "Limited Time"]
+        "tags": ["Event", "Promotion", "Engagement", "Limited Time", "Special Feature"]
+    },
+    "Run Trident Trials": {
+        "descriptions": [
+            "Launched Trident Trials event with {theme} theme for {duration}",
+            "Started {theme} Trident Trials tournament running for {duration}",
+            "Released special {theme} edition of Trident Trials for {duration}"
+        ],
+        "themes": [
+            "Deep Sea", "Neptune's Wrath", "Ocean's Bounty", "Atlantis", 
+            "Pirates' Revenge", "Kraken's Lair", "Mermaid's Grotto", "Poseidon's Realm",
+            "Coral Kingdom", "Sunken Treasure", "Mythical Waters", "Sea Monster"
+        ],
+        "durations": [
+            "weekend", "7 days", "5 days", "3 days", 
+            "limited time", "2 weeks", "special period", "extended weekend"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral"],
+            "dau": ["increase", "increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "increase", "neutral"],
+            "conversion_rate": ["neutral", "increase"]
         },
-        "BOGO": {
-            "descriptions": [
-                "Added Buy One Get One Free offer on {package} package",
-                "Launched BOGO promotion for {package} purchase",
-                "Special BOGO deal on {package} for {duration}"
-            ],
-            "packages": [
-                "coin", "gem", "VIP points", "special bundle", 
-                "premium currency", "booster", "power-up", "collector's item",
-                "mega pack", "starter bundle", "deluxe pack", "royal chest"
-            ],
-            "durations": [
-                "24 hours", "weekend", "limited time", "48 hours", 
-                "flash sale", "special event", "3 days", "holiday period"
-            ],
-            "impacts": {
-                "revenue": ["increase", "increase", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["neutral", "increase"],
-                "conversion_rate": ["increase", "increase", "neutral"]
-            },
-            "tags": ["Sale", "Promotion", "Value", "Limited Time", "Monetization"]
+        "tags": ["Tournament", "Event", "Engagement", "Competition", "Limited Time"]
+    },
+    "BOGO": {
+        "descriptions": [
+            "Added Buy One Get One Free offer on {package} package",
+            "Launched BOGO promotion for {package} purchase",
+            "Special BOGO deal on {package} for {duration}"
+        ],
+        "packages": [
+            "coin", "gem", "VIP points", "special bundle", 
+            "premium currency", "booster", "power-up", "collector's item",
+            "mega pack", "starter bundle", "deluxe pack", "royal chest"
+        ],
+        "durations": [
+            "24 hours", "weekend", "limited time", "48 hours", 
+            "flash sale", "special event", "3 days", "holiday period"
+        ],
+        "impacts": {
+            "revenue": ["increase", "increase", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["neutral", "increase"],
+            "conversion_rate": ["increase", "increase", "neutral"]
         },
-        "RTP Adjustments": {
-            "descriptions": [
-                "Adjusted {direction} RTP for {slot_type} slots by {percent}%",
-                "Modified RTP {direction} by {percent}% for {slot_type} machines",
-                "Tuned {slot_type} slots with {percent}% {direction} RTP adjustment"
-            ],
-            "directions": ["up", "down"],
-            "slot_types": [
-                "high volatility", "low stakes", "progressive jackpot", "classic", 
-                "video", "themed", "bonus heavy", "free spin focused",
-                "new", "underperforming", "popular", "seasonal"
-            ],
-            "percents": ["2", "5", "3", "1.5", "4", "2.5", "3.5", "1"],
-            "impacts": {
-                "revenue": ["increase", "decrease", "neutral"],
-                "dau": ["neutral", "increase", "decrease"],
-                "retention": ["increase", "decrease", "neutral"],
-                "session_length": ["increase", "decrease", "neutral"],
-                "conversion_rate": ["neutral", "increase", "decrease"]
-            },
-            "tags": ["Game Balance", "Economy", "Tuning", "Technical"]
+        "tags": ["Sale", "Promotion", "Value", "Limited Time", "Monetization"]
+    },
+    "RTP Adjustments": {
+        "descriptions": [
+            "Adjusted {direction} RTP for {slot_type} slots by {percent}%",
+            "Modified RTP {direction} by {percent}% for {slot_type} machines",
+            "Tuned {slot_type} slots with {percent}% {direction} RTP adjustment"
+        ],
+        "directions": ["up", "down"],
+        "slot_types": [
+            "high volatility", "low stakes", "progressive jackpot", "classic", 
+            "video", "themed", "bonus heavy", "free spin focused",
+            "new", "underperforming", "popular", "seasonal"
+        ],
+        "percents": ["2", "5", "3", "1.5", "4", "2.5", "3.5", "1"],
+        "impacts": {
+            "revenue": ["increase", "decrease", "neutral"],
+            "dau": ["neutral", "increase", "decrease"],
+            "retention": ["increase", "decrease", "neutral"],
+            "session_length": ["increase", "decrease", "neutral"],
+            "conversion_rate": ["neutral", "increase", "decrease"]
         },
-        "Pearly Rush Event": {
-            "descriptions": [
-                "Launched Pearly Rush event with {theme} theme for {duration}",
-                "Started {theme} Pearly Rush promotion running for {duration}",
-                "Released special {theme} edition of Pearly Rush for {duration}"
-            ],
-            "themes": [
-                "Ocean Depths", "Mermaid's Treasure", "Underwater Kingdom", "Oyster Bay", 
-                "Shell Collector", "Pearl Hunter", "Jewel of the Sea", "Reef Adventure",
-                "Tidal Wave", "Ocean's Gift", "Nautical Wonders", "Marine Mysteries"
-            ],
-            "durations": [
-                "weekend", "3 days", "5 days", "week-long", 
-                "limited time", "extended weekend", "special period", "holiday event"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["increase", "neutral"]
-            },
-            "tags": ["Event", "Promotion", "Engagement", "Collection", "Limited Time"]
+        "tags": ["Game Balance", "Economy", "Tuning", "Technical"]
+    },
+    "Pearly Rush Event": {
+        "descriptions": [
+            "Launched Pearly Rush event with {theme} theme for {duration}",
+            "Started {theme} Pearly Rush promotion running for {duration}",
+            "Released special {theme} edition of Pearly Rush for {duration}"
+        ],
+        "themes": [
+            "Ocean Depths", "Mermaid's Treasure", "Underwater Kingdom", "Oyster Bay", 
+            "Shell Collector", "Pearl Hunter", "Jewel of the Sea", "Reef Adventure",
+            "Tidal Wave", "Ocean's Gift", "Nautical Wonders", "Marine Mysteries"
+        ],
+        "durations": [
+            "weekend", "3 days", "5 days", "week-long", 
+            "limited time", "extended weekend", "special period", "holiday event"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["increase", "neutral"]
         },
-        "Dealers Edge Event": {
-            "descriptions": [
-                "Launched Dealers Edge event with {multiplier}x multiplier for {duration}",
-                "Started Dealers Edge promotion with {multiplier}x bonus for {duration}",
-                "Released special Dealers Edge event: {multiplier}x rewards for {duration}"
-            ],
-            "multipliers": ["2", "3", "1.5", "2.5", "4", "5", "3.5", "double"],
-            "durations": [
-                "weekend", "24 hours", "48 hours", "3 days", 
-                "limited time", "special event", "day-long", "holiday period"
-            ],
-            "impacts": {
-                "revenue": ["increase", "neutral"],
-                "dau": ["increase", "neutral"],
-                "retention": ["increase", "neutral"],
-                "session_length": ["increase", "neutral"],
-                "conversion_rate": ["increase", "neutral"]
-            },
-            "tags": ["Event", "Promotion", "Engagement", "Table Games", "Limited Time"]
-        }
+        "tags": ["Event", "Promotion", "Engagement", "Collection", "Limited Time"]
+    },
+    "Dealers Edge Event": {
+        "descriptions": [
+            "Launched Dealers Edge event with {multiplier}x multiplier for {duration}",
+            "Started Dealers Edge promotion with {multiplier}x bonus for {duration}",
+            "Released special Dealers Edge event: {multiplier}x rewards for {duration}"
+        ],
+        "multipliers": ["2", "3", "1.5", "2.5", "4", "5", "3.5", "double"],
+        "durations": [
+            "weekend", "24 hours", "48 hours", "3 days", 
+            "limited time", "special event", "day-long", "holiday period"
+        ],
+        "impacts": {
+            "revenue": ["increase", "neutral"],
+            "dau": ["increase", "neutral"],
+            "retention": ["increase", "neutral"],
+            "session_length": ["increase", "neutral"],
+            "conversion_rate": ["increase", "neutral"]
+        },
+        "tags": ["Event", "Promotion", "Engagement", "Table Games", "Limited Time"]
     }
+}
+
+# List of all categories
+CATEGORIES = list(CATEGORY_TEMPLATES.keys())
+
+# Placeholders of each category's description templates, paired with the
+# option lists their values are drawn from
+DESCRIPTION_FIELDS = {
+    category: [
+        (field, template[DESCRIPTION_OPTION_KEYS.get(field, field + "s")])
+        for field in sorted({
+            field
+            for description in template["descriptions"]
+            for _, field, _, _ in Formatter().parse(description)
+            if field
+        })
+    ]
+    for category, template in CATEGORY_TEMPLATES.items()
+}
+
+def _build_impact_options() -> Tuple[np.ndarray, np.ndarray]:
+    """Encode the expected impact options of every category and metric.
+    
+    Returns:
+        Tuple of (option codes of shape (categories, metrics, max options), padded
+        with 0, and number of options of shape (categories, metrics))
+    """
+    option_lists = [
+        [template["impacts"].get(metric, IMPACT_LABELS) for metric in METRICS]
+        for template in CATEGORY_TEMPLATES.values()
+    ]
+    counts = np.array([[len(options) for options in row] for row in option_lists], dtype=np.intp)
+    codes = np.zeros(counts.shape + (counts.max(),), dtype=np.intp)
+    for category_index, row in enumerate(option_lists):
+        for metric_index, options in enumerate(row):
+            codes[category_index, metric_index, :len(options)] = [IMPACT_CODES[option] for option in options]
+    return codes, counts
+
+# Expected impact options of each (category, metric) as impact codes
+IMPACT_OPTION_CODES, IMPACT_OPTION_COUNTS = _build_impact_options()
+
+def _compile_description(description: str, fields: List[str]) -> Tuple[str, Tuple[int, ...]]:
+    """Convert a ``str.format`` description template to a %-style template.
+    
+    Args:
+        description: Template with named placeholders, e.g. "Added '{theme}' slot"
+        fields: Placeholder names of the template's category, in value order
+        
+    Returns:
+        Tuple of (%-style template, position in ``fields`` of the value for each %s)
+    """
+    parts = []
+    positions = []
+    for literal, field, _, _ in Formatter().parse(description):
+        parts.append(literal.replace("%", "%%"))
+        if field:
+            parts.append("%s")
+            positions.append(fields.index(field))
+    return "".join(parts), tuple(positions)
+
+# Description templates of each category, compiled once so filling one in is
+# a single %-format of a values tuple rather than parsing the template again
+DESCRIPTION_TEMPLATES = {
+    category: [
+        _compile_description(description, [field for field, _ in DESCRIPTION_FIELDS[category]])
+        for description in template["descriptions"]
+    ]
+    for category, template in CATEGORY_TEMPLATES.items()
+}
+
+# Positions of the cooldown timers among the "Cooldown adjustments" values
+COOLDOWN_FIELDS = [field for field, _ in DESCRIPTION_FIELDS["Cooldown adjustments"]]
+COOLDOWN_OLD_INDEX = COOLDOWN_FIELDS.index("old")
+COOLDOWN_NEW_INDEX = COOLDOWN_FIELDS.index("new")
+
+# New cooldown timers to choose from for each old timer, so the two always differ
+COOLDOWN_NEW_TIMERS = {
+    old_timer: [
+        new_timer for new_timer in CATEGORY_TEMPLATES["Cooldown adjustments"]["new_timers"]
+        if new_timer != old_timer
+    ]
+    for old_timer in CATEGORY_TEMPLATES["Cooldown adjustments"]["old_timers"]
+}
+
+def generate_sample_data(num_changes: int = 500, seed: Optional[int] = None) -> KnowledgeRepository:
+    """Generate sample live ops changes and metrics for testing.
     
-    # List of all categories
-    categories = list(category_templates.keys())
+    All random draws (categories, dates, description options, expected impacts,
+    tags and metric values) are made for all changes at once with NumPy; only
+    building the objects runs per change.
     
-    # Common metrics across all changes
-    metrics = ["revenue", "dau", "retention", "session_length", "conversion_rate"]
+    Args:
+        num_changes: Number of changes to generate
+        seed: Optional seed for the NumPy random generator
+        
+    Returns:
+        Repository filled with the generated changes and metrics
+    """
+    repo = KnowledgeRepository()
+    rng = np.random.default_rng(seed)
     
     # Generate random changes over the past 30 days
     start_date = datetime.now() - timedelta(days=30)
     
+    # Draw the category and the minute within the 30 days of every change in
+    # batches, and offset the start date by all of them in one datetime64 operation
+    category_choices = rng.integers(0, len(CATEGORIES), size=num_changes)
+    minute_offsets = rng.integers(0, 30 * 24 * 60, size=num_changes)
+    change_dates = (np.datetime64(start_date, "us") + minute_offsets.astype("timedelta64[m]")).tolist()
+    
+    # Draw the template and option positions of every description in one batch
+    max_fields = max(len(fields) for fields in DESCRIPTION_FIELDS.values())
+    description_draws = rng.random((num_changes, max_fields + 1)).tolist()
+    
+    # Draw which metrics each change expects to impact (at least 2, up to all 5,
+    # in random order) and the position of each impact in its option list
+    impact_counts = rng.integers(2, len(METRICS) + 1, size=num_changes)
+    impact_orders = np.argsort(rng.random((num_changes, len(METRICS))), axis=1)
+    impact_draws = rng.random((num_changes, len(METRICS)))
+    
+    # Look up the drawn impact code of every change and metric in the option
+    # table, then clear the metrics past each change's impact count
+    option_positions = (impact_draws * IMPACT_OPTION_COUNTS[category_choices]).astype(np.intp)
+    impact_codes = IMPACT_OPTION_CODES[category_choices[:, None], np.arange(len(METRICS)), option_positions]
+    impact_codes[np.argsort(impact_orders, axis=1) >= impact_counts[:, None]] = 0
+    
+    # Draw the position of every change's tag in its category's tag list
+    tag_draws = rng.random(num_changes).tolist()
+    
+    category_rows = category_choices.tolist()
+    impact_order_rows = impact_orders.tolist()
+    impact_count_rows = impact_counts.tolist()
+    impact_code_rows = impact_codes.tolist()
+    
+    changes = []
     for i in range(num_changes):
-        # Select a random category for this change
-        category = random.choice(categories)
-        template = category_templates[category]
-        
-        # Create change date
-        change_date = start_date + timedelta(days=random.randint(0, 29), 
-                                            hours=random.randint(0, 23),
-                                            minutes=random.randint(0, 59))
+        # Select the category for this change
+        category = CATEGORIES[category_rows[i]]
+        template = CATEGORY_TEMPLATES[category]
         
-        # Generate description based on template
-        description_template = random.choice(template["descriptions"])
+        # Fill a random description template with random option values
+        draws = description_draws[i]
+        description_values = [
+            options[int(draw * len(options))]
+            for (_, options), draw in zip(DESCRIPTION_FIELDS[category], draws[1:])
+        ]
+        if category == "Cooldown adjustments":
+            # Draw the new timer among those different from the old timer
+            new_timers = COOLDOWN_NEW_TIMERS[description_values[COOLDOWN_OLD_INDEX]]
+            description_values[COOLDOWN_NEW_INDEX] = new_timers[int(draws[1 + COOLDOWN_NEW_INDEX] * len(new_timers))]
+        templates = DESCRIPTION_TEMPLATES[category]
+        description_template, positions = templates[int(draws[0] * len(templates))]
+        description = description_template % tuple(description_values[position] for position in positions)
         
-        # Fill in the template with random values
-        if category == "Add Slot":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                position=random.choice(template["positions"])
-            )
-        elif category == "Remove Slot":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                position=random.choice(template["positions"]),
-                reason=random.choice(template["reasons"])
-            )
-        elif category == "Add Sneak Peek Slot":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                duration=random.choice(template["durations"]),
-                position=random.choice(template["positions"])
-            )
-        elif category == "Extend Scratcher":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                duration=random.choice(template["durations"])
-            )
-        elif category == "Slot Track Positioning adjustment":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                old_position=random.choice(template["old_positions"]),
-                new_position=random.choice(template["new_positions"])
-            )
-        elif category == "Cooldown adjustments":
-            old_timer = random.choice(template["old_timers"])
-            # Make sure new timer is different from old timer
-            new_timer = old_timer
-            while new_timer == old_timer:
-                new_timer = random.choice(template["new_timers"])
-                
-            description = description_template.format(
-                feature=random.choice(template["features"]),
-                old=old_timer,
-                new=new_timer
-            )
-        elif category == "Purchase Quests":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                reward=random.choice(template["rewards"])
-            )
-        elif category == "Test Configurations":
-            description = description_template.format(
-                variant=random.choice(template["variants"]),
-                feature=random.choice(template["features"]),
-                segment=random.choice(template["segments"])
-            )
-        elif category == "Sale Themes":
-            description = description_template.format(
-                holiday=random.choice(template["holidays"]),
-                discount=random.choice(template["discounts"])
-            )
-        elif category == "RYD Multiplier":
-            description = description_template.format(
-                multiplier=random.choice(template["multipliers"]),
-                duration=random.choice(template["durations"])
-            )
-        elif category == "Run Trident Trials":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                duration=random.choice(template["durations"])
-            )
-        elif category == "BOGO":
-            description = description_template.format(
-                package=random.choice(template["packages"]),
-                duration=random.choice(template.get("durations", ["limited time"]))
-            )
-        elif category == "RTP Adjustments":
-            description = description_template.format(
-                direction=random.choice(template["directions"]),
-                slot_type=random.choice(template["slot_types"]),
-                percent=random.choice(template["percents"])
-            )
-        elif category == "Pearly Rush Event":
-            description = description_template.format(
-                theme=random.choice(template["themes"]),
-                duration=random.choice(template["durations"])
-            )
-        elif category == "Dealers Edge Event":
-            description = description_template.format(
-                multiplier=random.choice(template["multipliers"]),
-                duration=random.choice(template["durations"])
-            )
-        else:
-            description = f"Generic {category} change"
+        # Expected impact on the impacted metrics, in this change's random order
+        change_impact_codes = impact_code_rows[i]
+        expected_impact = {
+            METRICS[j]: IMPACT_LABELS[change_impact_codes[j] - 1]
+            for j in impact_order_rows[i][:impact_count_rows[i]]
+        }
         
-        # Expected impact
-        expected_impact = {}
-        for metric in random.sample(metrics, k=random.randint(2, 5)):  # At least 2 metrics, up to all 5
-            if metric in template["impacts"]:
-                expected_impact[metric] = random.choice(template["impacts"][metric])
-            else:
-                expected_impact[metric] = random.choice(["increase", "decrease", "neutral"])
-            
         # Create the change object
-        change_id = f"change_{i}"
-        change = LiveOpsChange(
-            change_id=change_id,
-            timestamp=change_date,
+        changes.append(LiveOpsChange(
+            change_id=f"change_{i}",
+            timestamp=change_dates[i],
             category=category,
             description=description,
             expected_impact=expected_impact,
-            tags=[random.choice(template["tags"])]
-        )
-        repo.add_change(change)
-        
-        # Generate metrics for this change
-        for metric_name in metrics:
-            # Base values for different metrics
-            base_values = {
-                "revenue": random.uniform(10000, 50000),
-                "dau": random.uniform(10000, 100000),
-                "retention": random.uniform(20, 40),
-                "session_length": random.uniform(10, 30),
-                "conversion_rate": random.uniform(2, 8)
-            }
-            
-            # Generate before value
-            before_value = base_values[metric_name]
-            
-            # Generate after value based on expected impact
-            impact_multiplier = 1.0
-            if metric_name in expected_impact:
-                if expected_impact[metric_name] == "increase":
-                    impact_multiplier = random.uniform(1.05, 1.35)
-                elif expected_impact[metric_name] == "decrease":
-                    impact_multiplier = random.uniform(0.65, 0.95)
-                else:  # neutral
-                    impact_multiplier = random.uniform(0.97, 1.03)
-            
-            # Add some randomness to make it realistic
-            impact_multiplier *= random.uniform(0.95, 1.05)
-            
-            after_value = before_value * impact_multiplier
-            
-            # Create metric measurement with timestamp
-            metric = MetricMeasurement(
-                change_id=change_id,
+            tags=[template["tags"][int(tag_draws[i] * len(template["tags"]))]]
+        ))
+    
+    # Draw before values and impact multipliers for every change and metric at once
+    before_values = np.column_stack([
+        rng.uniform(*METRIC_RANGES[metric_name], size=num_changes) for metric_name in METRICS
+    ])
+    impact_multipliers = rng.uniform(IMPACT_MULTIPLIER_LOW[impact_codes], IMPACT_MULTIPLIER_HIGH[impact_codes])
+    
+    # Add some randomness to make it realistic
+    impact_multipliers *= rng.uniform(0.95, 1.05, size=impact_codes.shape)
+    after_values = before_values * impact_multipliers
+    
+    # Create metric measurements with the change's timestamp
+    measurements = []
+    for change, change_before_values, change_after_values in zip(changes, before_values.tolist(), after_values.tolist()):
+        for metric_name, before_value, after_value in zip(METRICS, change_before_values, change_after_values):
+            measurements.append(MetricMeasurement(
+                change_id=change.change_id,
                 metric_name=metric_name,
                 before_value=before_value,
                 after_value=after_value,
-                timestamp=change_date  # Use the change's timestamp
-            )
-            repo.add_metric(metric)
+                timestamp=change.timestamp,
+                defer_percent_change=True
+            ))
+    
+    # Add everything in one batch; percent changes for all metrics are computed at once
+    repo.add_many(changes, measurements)
     
     return repo
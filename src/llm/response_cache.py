@@ -0,0 +1,95 @@
+"""
+Exact-match response cache for LLM calls.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+
+class ResponseCache:
+    """Caches LLM responses keyed by a hash of the full request text.
+    
+    A cached response is only reused for a request with exactly the same
+    system prompt, context and prompt. Prompts built from the same template
+    differ only in their change, category or metric data, so approximate
+    matching would answer one change's question with another's analysis.
+    The least recently used entry is evicted once ``capacity`` is reached.
+    """
+    
+    def __init__(self, capacity: int = 256):
+        """Initialize the response cache.
+        
+        Args:
+            capacity: Maximum number of cached responses
+        """
+        self.capacity = capacity
+        self._responses: OrderedDict[str, str] = OrderedDict()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(prompt: str, cache_scope: str = "") -> str:
+        """Build the cache key of a request.
+        
+        Args:
+            prompt: Prompt text sent to the LLM
+            cache_scope: Fixed prompt content sent with it (system and context prompts)
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        key = hashlib.sha256()
+        key.update(cache_scope.encode())
+        key.update(b"\0")
+        key.update(prompt.encode())
+        return key.hexdigest()
+    
+    def lookup(self, key: str) -> Optional[str]:
+        """Find the cached response of a request.
+        
+        Args:
+            key: Key returned by ``make_key``
+        
+        Returns:
+            Cached response text, or None on a cache miss
+        """
+        response = self._responses.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        
+        self._responses.move_to_end(key)
+        self.hits += 1
+        return response
+    
+    def store(self, key: str, response: str) -> None:
+        """Store a response, evicting the least recently used entry when full.
+        
+        Args:
+            key: Key returned by ``make_key``
+            response: Response text to cache
+        """
+        self._responses[key] = response
+        self._responses.move_to_end(key)
+        if len(self._responses) > self.capacity:
+            self._responses.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._responses.clear()
+    
+    def get_stats(self) -> dict:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary containing:
+            - size: Number of cached responses
+            - hits: Number of lookups served from the cache
+            - misses: Number of lookups that required an LLM call
+        """
+        return {
+            "size": len(self._responses),
+            "hits": self.hits,
+            "misses": self.misses
+        }
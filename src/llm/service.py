@@ -1,6 +1,6 @@
 import os
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Callable, Iterator, Union
 import anthropic # type: ignore
 
 from .prompts.system_prompts import (
@@ -18,98 +18,237 @@ from .prompts.query_prompts import (
     generate_query_prompt,
     generate_complex_query_prompt
 )
+from .response_cache import ResponseCache
+
+LLM_DISABLED_MESSAGE = "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
+USAGE_LIMIT_MESSAGE = "API usage limit reached. To conserve credits, LLM features have been temporarily disabled."
+
+def to_prompt_json(data: Any) -> str:
+    """Serialize prompt data as compact JSON.
+    
+    Indentation whitespace is billed as input tokens, so prompts are sent without it.
+    """
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
 
 class LLMService:
+    # Prompt template and system prompt used by answer_query for each intent type
+    QUERY_PROMPTS = {
+        "category_analysis": (generate_category_analysis_prompt, CATEGORY_ANALYSIS_PROMPT),
+        "metric_trend": (generate_trend_analysis_prompt, TREND_ANALYSIS_PROMPT),
+        "comparative_analysis": (generate_complex_query_prompt, QUERY_ANALYSIS_PROMPT),
+        "causal_analysis": (generate_complex_query_prompt, QUERY_ANALYSIS_PROMPT)
+    }
+    
     def __init__(self, api_key: Optional[str] = None):
         # Use provided API key or try to get from environment variable
         self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
         
+        self.model = "claude-3-7-sonnet-20250219"  # Use this model or a less expensive one
+        self.usage_count = 0
+        self.usage_limit = 50  # Adjust based on credit allocation
+        
         if not self.api_key:
             self.is_enabled = False
             print("WARNING: No Anthropic API key found. LLM features will be disabled.")
         else:
             self.is_enabled = True
             self.client = anthropic.Anthropic(api_key=self.api_key)
-            self.model = "claude-3-7-sonnet-20250219"  # Use this model or a less expensive one
-            self.usage_count = 0
-            self.usage_limit = 50  # Adjust based on credit allocation
             
         # Initialize token counter
         from .token_counter import TokenCounter
         self.token_counter = TokenCounter()
+        
+        # Response cache for repeated requests, disabled until enable_response_cache is called
+        self.response_cache: Optional[ResponseCache] = None
+    
+    def enable_response_cache(self, **cache_kwargs) -> None:
+        """Serve repeated identical requests from a response cache.
+        
+        Args:
+            **cache_kwargs: ResponseCache configuration
+        """
+        self.response_cache = ResponseCache(**cache_kwargs)
             
-    def generate_response(self, prompt: str, system_prompt: str = "", max_tokens: int = 1000) -> str:
+    def generate_response(self, prompt: str, system_prompt: str = "", max_tokens: int = 1000, context_prompt: str = "") -> str:
         """Generate a response from the LLM model."""
-        if not self.is_enabled:
-            return "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
-        
-        # Check usage limit
-        if self.usage_count >= self.usage_limit:
-            return "API usage limit reached. To conserve credits, LLM features have been temporarily disabled."
+        cache_scope = self._cache_scope(system_prompt, context_prompt)
+        early_response, cache_key = self._check_request(prompt, cache_scope)
+        if early_response is not None:
+            return early_response
         
         try:
-            # Track token usage
-            token_stats = self.token_counter.track_query(
-                context_text=system_prompt,
-                query_text=prompt
-            )
-            
-            # Increment usage count (do this before the API call in case of errors)
-            self.usage_count += 1
-            
             message = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+                **self._build_request(prompt, system_prompt, max_tokens, context_prompt)
             )
-            return message.content[0].text
+            return self._handle_message(message, cache_key)
         except Exception as e:
             return f"Error generating LLM response: {str(e)}"
     
-    def analyze_change_impact(self, change_data: Dict[str, Any], domain_context: Dict[str, Any], confounding_factors: list) -> str:
-        """Generate an analysis of the impact of a change based on provided data."""
+    def stream_response(self, prompt: str, system_prompt: str = "", max_tokens: int = 1000, context_prompt: str = "") -> Iterator[str]:
+        """Generate a response from the LLM model, yielding text as it arrives.
+        
+        Cached responses and error messages are yielded as a single chunk. The
+        complete streamed response is stored in the response cache like
+        ``generate_response`` does.
+        """
+        cache_scope = self._cache_scope(system_prompt, context_prompt)
+        early_response, cache_key = self._check_request(prompt, cache_scope)
+        if early_response is not None:
+            yield early_response
+            return
+        
+        try:
+            with self.client.messages.stream(
+                **self._build_request(prompt, system_prompt, max_tokens, context_prompt)
+            ) as stream:
+                yield from stream.text_stream
+                message = stream.get_final_message()
+            self._handle_message(message, cache_key)
+        except Exception as e:
+            yield f"Error generating LLM response: {str(e)}"
+    
+    @staticmethod
+    def _cache_scope(system_prompt: str, context_prompt: str) -> str:
+        """Key that separates response cache entries generated with different fixed prompt content."""
+        return f"{system_prompt}\x00{context_prompt}" if context_prompt else system_prompt
+    
+    def _check_request(self, prompt: str, cache_scope: str) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve a request locally when it does not need an API call.
+        
+        Returns:
+            Tuple of (early_response, cache_key). early_response is set when the
+            service is disabled, the response is cached, or the usage limit is
+            reached. cache_key is set when the response should be cached.
+        """
         if not self.is_enabled:
-            return "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
+            return (LLM_DISABLED_MESSAGE, None)
         
-        # Generate prompt using the template
-        prompt_data = generate_change_analysis_prompt(change_data, domain_context, confounding_factors)
+        # Serve identical requests from the cache (does not count towards the usage limit)
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.make_key(prompt, cache_scope)
+            cached_response = self.response_cache.lookup(cache_key)
+            if cached_response is not None:
+                return (cached_response, None)
         
-        # Convert to JSON string for the LLM
-        prompt = json.dumps(prompt_data, indent=2)
+        # Check usage limit
+        if self.usage_count >= self.usage_limit:
+            return (USAGE_LIMIT_MESSAGE, None)
         
-        # Use the specific system prompt for change analysis
-        return self.generate_response(prompt, CHANGE_ANALYSIS_PROMPT)
+        return (None, cache_key)
     
-    def analyze_metric_trend(self, metric_name: str, trend_data: list, domain_context: Dict[str, Any]) -> str:
-        """Generate an analysis of trends for a specific metric."""
-        if not self.is_enabled:
-            return "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
+    def _build_request(self, prompt: str, system_prompt: str, max_tokens: int, context_prompt: str = "") -> Dict[str, Any]:
+        """Track usage and build the keyword arguments for ``messages.create``.
         
-        # Generate prompt using the template
-        prompt_data = generate_trend_analysis_prompt(metric_name, trend_data, domain_context)
+        A non-empty context_prompt is sent as a cacheable user content block
+        ahead of the prompt, so calls sharing it reuse the cached prefix.
+        """
+        # Track token usage
+        self.token_counter.track_query(
+            context_text=system_prompt + context_prompt,
+            query_text=prompt
+        )
         
-        # Convert to JSON string for the LLM
-        prompt = json.dumps(prompt_data, indent=2)
+        # Increment usage count (do this before the API call in case of errors)
+        self.usage_count += 1
         
-        # Use the specific system prompt for trend analysis
-        return self.generate_response(prompt, TREND_ANALYSIS_PROMPT)
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "system": self._build_system_blocks(system_prompt),
+            "messages": [
+                {"role": "user", "content": self._build_user_content(prompt, context_prompt)}
+            ]
+        }
     
-    def analyze_category(self, category: str, metrics_stats: Dict[str, Any], sample_changes: list, domain_context: Dict[str, Any]) -> str:
-        """Generate an analysis of a category of changes."""
-        if not self.is_enabled:
-            return "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
+    def _handle_message(self, message: Any, cache_key: Optional[str]) -> str:
+        """Record usage for an API response and return its text."""
+        # Record prompt cache hits/writes reported by the API
+        self.token_counter.track_cache_usage(
+            cache_read_tokens=getattr(message.usage, "cache_read_input_tokens", 0) or 0,
+            cache_creation_tokens=getattr(message.usage, "cache_creation_input_tokens", 0) or 0
+        )
         
-        # Generate prompt using the template
-        prompt_data = generate_category_analysis_prompt(category, metrics_stats, sample_changes, domain_context)
+        response = message.content[0].text
+        if cache_key is not None:
+            self.response_cache.store(cache_key, response)
+        return response
+    
+    def _build_system_blocks(self, system_prompt: str):
+        """Wrap a system prompt in a cacheable content block.
         
-        # Convert to JSON string for the LLM
-        prompt = json.dumps(prompt_data, indent=2)
+        The system prompts are module-level constants, so marking them with
+        ``cache_control`` lets Anthropic reuse the cached prefix across calls.
+        Empty prompts are passed through unchanged since they cannot be cached.
+        """
+        if not system_prompt:
+            return system_prompt
+        return [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+    
+    def _invoke(
+        self,
+        prompt_builder: Callable[..., Dict[str, Any]],
+        system_prompt: str,
+        *args,
+        stable_keys: Tuple[str, ...] = (),
+        **kwargs
+    ) -> str:
+        """Build a prompt with the given template function and send it to the LLM.
         
-        # Use the specific system prompt for category analysis
-        return self.generate_response(prompt, CATEGORY_ANALYSIS_PROMPT)
+        Prompt fields named in stable_keys are sent as a separate cacheable context block.
+        """
+        if not self.is_enabled:
+            return LLM_DISABLED_MESSAGE
+        prompt, context_prompt = self._split_prompt(prompt_builder(*args, **kwargs), stable_keys)
+        return self.generate_response(prompt, system_prompt, context_prompt=context_prompt)
+    
+    @staticmethod
+    def _split_prompt(prompt_data: Dict[str, Any], stable_keys: Tuple[str, ...]) -> Tuple[str, str]:
+        """Serialize prompt data, moving the stable_keys fields into a separate context prompt.
+        
+        Returns:
+            Tuple of (prompt, context_prompt); context_prompt is empty when there are no stable fields
+        """
+        stable_data = {key: prompt_data.pop(key) for key in stable_keys if key in prompt_data}
+        context_prompt = to_prompt_json(stable_data) if stable_data else ""
+        return to_prompt_json(prompt_data), context_prompt
+    
+    def _build_user_content(self, prompt: str, context_prompt: str) -> Union[str, List[Dict[str, Any]]]:
+        """Build user message content, placing fixed context in its own cacheable block."""
+        if not context_prompt:
+            return prompt
+        return [
+            {
+                "type": "text",
+                "text": context_prompt,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": prompt
+            }
+        ]
+    
+    def analyze_change_impact(self, change_data: Dict[str, Any], domain_context: Dict[str, Any], confounding_factors: list) -> str:
+        """Generate an analysis of the impact of a change based on provided data."""
+        return self._invoke(
+            generate_change_analysis_prompt, CHANGE_ANALYSIS_PROMPT, change_data, domain_context, confounding_factors,
+            stable_keys=("domain_context",)
+        )
+    
+    def analyze_metric_trend(self, metric_name: str, trend_data: list, domain_context: Dict[str, Any]) -> str:
+        """Generate an analysis of trends for a specific metric."""
+        return self._invoke(generate_trend_analysis_prompt, TREND_ANALYSIS_PROMPT, metric_name, trend_data, domain_context)
+    
+    def analyze_category(self, category: str, metrics_stats: Dict[str, Any], sample_changes: list, domain_context: Dict[str, Any]) -> str:
+        """Generate an analysis of a category of changes."""
+        return self._invoke(generate_category_analysis_prompt, CATEGORY_ANALYSIS_PROMPT, category, metrics_stats, sample_changes, domain_context)
     
     def answer_query(
         self,
@@ -128,73 +267,50 @@ class LLMService:
             Generated answer based on the query, intent, and context
         """
         if not self.is_enabled:
-            return "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
+            return LLM_DISABLED_MESSAGE
+        
+        prompt, system_prompt = self._build_query_prompt(query, intent_analysis, context)
+        return self.generate_response(prompt, system_prompt)
+    
+    def stream_answer_query(
+        self,
+        query: str,
+        intent_analysis: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Streaming variant of ``answer_query`` that yields text chunks as they arrive."""
+        if not self.is_enabled:
+            yield LLM_DISABLED_MESSAGE
+            return
+        
+        prompt, system_prompt = self._build_query_prompt(query, intent_analysis, context)
+        yield from self.stream_response(prompt, system_prompt)
+    
+    def _build_query_prompt(
+        self,
+        query: str,
+        intent_analysis: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """Build the prompt and pick the system prompt for a natural language query.
         
+        Returns:
+            Tuple of (prompt, system_prompt)
+        """
         # Track token usage for context
         self.token_counter.track_query(
-            context_text=json.dumps(context, indent=2),
+            context_text=to_prompt_json(context),
             query_text=query
         )
         
-        # Generate prompt based on intent type
-        intent_type = intent_analysis["intent_type"]
-        
-        if intent_type == "category_analysis":
-            prompt_data = generate_category_analysis_prompt(
-                query=query,
-                intent_analysis=intent_analysis,
-                context=context
-            )
-            system_prompt = CATEGORY_ANALYSIS_PROMPT
-            
-        elif intent_type == "metric_trend":
-            prompt_data = generate_trend_analysis_prompt(
-                query=query,
-                intent_analysis=intent_analysis,
-                context=context
-            )
-            system_prompt = TREND_ANALYSIS_PROMPT
-            
-        elif intent_type == "comparative_analysis":
-            prompt_data = generate_complex_query_prompt(
-                query=query,
-                intent_analysis=intent_analysis,
-                context=context
-            )
-            system_prompt = QUERY_ANALYSIS_PROMPT
-            
-        elif intent_type == "causal_analysis":
-            prompt_data = generate_complex_query_prompt(
-                query=query,
-                intent_analysis=intent_analysis,
-                context=context
-            )
-            system_prompt = QUERY_ANALYSIS_PROMPT
-            
-        else:  # general_query or other types
-            prompt_data = generate_query_prompt(
-                query=query,
-                intent_analysis=intent_analysis,
-                context=context
-            )
-            system_prompt = QUERY_ANALYSIS_PROMPT
-        
-        # Convert to JSON string for the LLM
-        prompt = json.dumps(prompt_data, indent=2)
-        
-        # Generate response with appropriate system prompt
-        return self.generate_response(prompt, system_prompt)
+        # Generate prompt with the template and system prompt for the intent type
+        prompt_builder, system_prompt = self.QUERY_PROMPTS.get(
+            intent_analysis["intent_type"],
+            (generate_query_prompt, QUERY_ANALYSIS_PROMPT)  # general_query or other types
+        )
+        prompt_data = prompt_builder(query=query, intent_analysis=intent_analysis, context=context)
+        return to_prompt_json(prompt_data), system_prompt
     
     def answer_complex_query(self, query: str, related_data: Dict[str, Any], domain_context: Dict[str, Any]) -> str:
         """Generate an answer to a complex query that spans multiple intents."""
-        if not self.is_enabled:
-            return "LLM service is not configured. Please set ANTHROPIC_API_KEY environment variable."
-        
-        # Generate prompt using the template
-        prompt_data = generate_complex_query_prompt(query, related_data, domain_context)
-        
-        # Convert to JSON string for the LLM
-        prompt = json.dumps(prompt_data, indent=2)
-        
-        # Use the specific system prompt for query analysis
-        return self.generate_response(prompt, QUERY_ANALYSIS_PROMPT)
+        return self._invoke(generate_complex_query_prompt, QUERY_ANALYSIS_PROMPT, query, related_data, domain_context)
@@ -9,6 +9,8 @@ class TokenCounter:
         """Initialize token counter with default settings."""
         self.total_tokens_sent = 0
         self.query_count = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
         self.char_to_token_ratio = 4  # Approximate ratio
     
     def estimate_tokens(self, text: str) -> int:
@@ -48,6 +50,16 @@ class TokenCounter:
             "total_tokens": total_tokens
         }
     
+    def track_cache_usage(self, cache_read_tokens: int, cache_creation_tokens: int) -> None:
+        """Track prompt cache usage reported by the LLM provider.
+        
+        Args:
+            cache_read_tokens: Input tokens served from the prompt cache
+            cache_creation_tokens: Input tokens written to the prompt cache
+        """
+        self.cache_read_tokens += cache_read_tokens
+        self.cache_creation_tokens += cache_creation_tokens
+    
     def get_stats(self) -> dict:
         """Get token usage statistics.
         
@@ -56,9 +68,13 @@ class TokenCounter:
             - total_tokens_sent: Total tokens sent to LLM
             - query_count: Number of queries processed
             - avg_tokens_per_query: Average tokens per query
+            - cache_read_tokens: Input tokens served from the prompt cache
+            - cache_creation_tokens: Input tokens written to the prompt cache
         """
         return {
             "total_tokens_sent": self.total_tokens_sent,
             "query_count": self.query_count,
-            "avg_tokens_per_query": self.total_tokens_sent / max(1, self.query_count)
+            "avg_tokens_per_query": self.total_tokens_sent / max(1, self.query_count),
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_creation_tokens": self.cache_creation_tokens
         }
@@ -1,11 +1,14 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-import json
+from typing import Dict, Optional
+import numpy as np
 
 from src.data.repository import KnowledgeRepository
 from src.llm.service import LLMService
 from src.rag.indexing.indexes import IndexBuilder
 from src.rag.domain_knowledge.context import DomainKnowledgeManager
+from src.rag.analysis.impact import classify_impacts
+
+METRIC_NAMES = ["revenue", "dau", "retention", "session_length", "conversion_rate"]
 
 class ChangeAnalyzer:
     def __init__(
@@ -33,29 +36,28 @@ class ChangeAnalyzer:
         # Get metrics for this change as dictionaries
         metrics = self.knowledge_repo.get_metrics_for_change(change_id)
         
-        # Analyze if expected impacts were achieved
+        # Analyze if expected impacts were achieved, classifying all metrics at once
+        expected_impacts = [change_dict["expected_impact"].get(m["metric_name"], "neutral") for m in metrics]
+        actual_impacts, matched_expectations = classify_impacts(
+            [m["percent_change"] for m in metrics],
+            expected_impacts
+        )
+        
         impact_analysis = {}
-        for metric in metrics:
-            expected = change_dict["expected_impact"].get(metric["metric_name"], "neutral")
-            
-            # Determine if the actual change matched expectations
-            actual = "neutral"
-            if metric["percent_change"] > 5:
-                actual = "increase"
-            elif metric["percent_change"] < -5:
-                actual = "decrease"
-                
+        for metric, expected, actual, matched in zip(
+            metrics, expected_impacts, actual_impacts.tolist(), matched_expectations.tolist()
+        ):
             impact_analysis[metric["metric_name"]] = {
                 "expected": expected,
                 "actual": actual,
                 "percent_change": metric["percent_change"],
                 "before": metric["before_value"],
                 "after": metric["after_value"],
-                "matched_expectation": expected == actual or (expected == "neutral" and -5 <= metric["percent_change"] <= 5)
+                "matched_expectation": matched
             }
         
         # Find changes made within 3 days before this change
-        change_date = datetime.fromisoformat(change_dict["timestamp"])
+        change_date = change.timestamp
         start_date = change_date - timedelta(days=3)
         end_date = change_date - timedelta(minutes=5)  # Just before this change
         recent_changes = self.index_builder.search_by_date_range(start_date, end_date)
@@ -78,7 +80,7 @@ class ChangeAnalyzer:
                 if hasattr(m, "to_dict"):
                     metrics_dicts.append(m.to_dict())
                 else:
-                    metrics_dicts.append(m)
+                    metrics_dicts.append(dict(m))
             
             similar_category_changes.append({
                 "change": similar_change_dict,
@@ -91,7 +93,7 @@ class ChangeAnalyzer:
             change_data = {
                 "category": change_dict["category"],
                 "description": change_dict["description"],
-                "timestamp": datetime.fromisoformat(change_dict["timestamp"]).strftime("%Y-%m-%d %H:%M"),
+                "timestamp": change.timestamp.strftime("%Y-%m-%d %H:%M"),
                 "tags": change_dict["tags"],
                 "expected_impact": change_dict["expected_impact"],
                 "metrics_data": {
@@ -118,14 +120,18 @@ class ChangeAnalyzer:
                 # Convert recent changes to dictionaries
                 recent_changes_dicts = []
                 for r in recent_changes[:3]:
-                    if hasattr(r["change"], "to_dict"):
-                        recent_change_dict = r["change"].to_dict()
+                    # Read fields directly from change objects to avoid a to_dict/ISO round trip
+                    recent_change = r["change"]
+                    if hasattr(recent_change, "to_dict"):
+                        category, description = recent_change.category, recent_change.description
+                        recent_timestamp = recent_change.timestamp
                     else:
-                        recent_change_dict = r["change"]
+                        category, description = recent_change["category"], recent_change["description"]
+                        recent_timestamp = datetime.fromisoformat(recent_change["timestamp"])
                     recent_changes_dicts.append({
-                        "category": recent_change_dict["category"],
-                        "description": recent_change_dict["description"],
-                        "timestamp": datetime.fromisoformat(recent_change_dict["timestamp"]).strftime("%Y-%m-%d %H:%M")
+                        "category": category,
+                        "description": description,
+                        "timestamp": recent_timestamp.strftime("%Y-%m-%d %H:%M")
                     })
                 
                 confounding_factors.append({
@@ -137,16 +143,18 @@ class ChangeAnalyzer:
             # Add historical performance data
             if similar_category_changes:
                 # Calculate average metric impacts for similar changes
+                similar_positions = np.array([
+                    i for i in self.index_builder.category_index.get(change_dict["category"], [])
+                    if self.knowledge_repo.changes[i].change_id != change_id
+                ], dtype=np.intp)
+                
                 avg_impacts = {}
-                for metric_name in ["revenue", "dau", "retention", "session_length", "conversion_rate"]:
-                    values = []
-                    for r in similar_category_changes:
-                        for m in r["metrics"]:
-                            if m["metric_name"] == metric_name:
-                                values.append(m["percent_change"])
+                for metric_name in METRIC_NAMES:
+                    columns = self.knowledge_repo.get_metric_columns(metric_name)
+                    values = columns["percent_change"][np.isin(columns["change_index"], similar_positions)]
                     
-                    if values:
-                        avg_impacts[metric_name] = sum(values) / len(values)
+                    if values.size:
+                        avg_impacts[metric_name] = float(values.mean())
                 
                 confounding_factors.append({
                     "type": "historical_performance",
@@ -178,52 +186,69 @@ class ChangeAnalyzer:
     
     def analyze_metric_trends(self, metric_name: str, weeks: int = 4) -> Dict:
         """Analyze trends for a specific metric over time."""
-        # Get all changes sorted by time
-        all_changes = [(i, self.knowledge_repo.changes[i]) for i in self.index_builder.temporal_index]
+        # Catch up with changes added through another session's index builder
+        self.index_builder.sync()
+        changes = self.knowledge_repo.changes
+        # Week ids and temporal ranks exist only for changes the indexes cover
+        indexed_count = len(self.index_builder.temporal_index)
         
-        # Group by week
-        weekly_data = {}
-        for i, change in all_changes:
-            # Convert change to dictionary
-            change_dict = change.to_dict()
-            timestamp = datetime.fromisoformat(change_dict["timestamp"])
-            week = timestamp.strftime("%Y-%U")
-            if week not in weekly_data:
-                weekly_data[week] = {
-                    "changes": [],
-                    "metric_values": [],
-                    "percent_changes": []
-                }
-            
-            # Get metrics as dictionaries
-            metrics = self.knowledge_repo.get_metrics_for_change(change_dict["change_id"])
-            metric = next((m for m in metrics if m["metric_name"] == metric_name), None)
-            
-            if metric:
-                weekly_data[week]["changes"].append(change_dict)
-                weekly_data[week]["metric_values"].append(metric["after_value"])
-                weekly_data[week]["percent_changes"].append(metric["percent_change"])
+        # Integer id of each change's week; "%Y-%U" names sort chronologically
+        week_names = sorted(self.index_builder.weekly_buckets)
+        week_ids = np.empty(indexed_count, dtype=np.intp)
+        for week_id, week in enumerate(week_names):
+            week_ids[self.index_builder.weekly_buckets[week]] = week_id
+        
+        # The most recent weeks that had any change
+        recent_weeks = week_names[::-1][:weeks]
+        is_recent = np.zeros(len(week_names), dtype=bool)
+        is_recent[len(week_names) - 1 - np.arange(len(recent_weeks))] = True
+        
+        # Temporal rank of each change, so ties go to the earliest change
+        temporal_rank = np.empty(indexed_count, dtype=np.intp)
+        temporal_rank[self.index_builder.temporal_index] = np.arange(indexed_count)
+        
+        # First measurement of the metric for each indexed change in a recent week
+        columns = self.knowledge_repo.get_metric_columns(metric_name)
+        _, first = np.unique(columns["change_index"], return_index=True)
+        first = first[columns["change_index"][first] < indexed_count]
+        first = first[is_recent[week_ids[columns["change_index"][first]]]]
+        # A measurement without a percent change can be neither averaged nor ranked
+        first = first[~np.isnan(columns["percent_change"][first])]
+        change_index = columns["change_index"][first]
+        
+        # Sort by week, then temporal order, so each week is one contiguous segment
+        order = np.lexsort((temporal_rank[change_index], week_ids[change_index]))
+        change_index = change_index[order]
+        week = week_ids[change_index]
+        after_values = columns["after_value"][first][order]
+        percent_changes = columns["percent_change"][first][order]
         
-        # Calculate weekly averages and identify top performing changes
         trend_analysis = []
-        for week, data in sorted(weekly_data.items(), key=lambda x: x[0], reverse=True)[:weeks]:
-            if data["metric_values"]:
-                avg_value = sum(data["metric_values"]) / len(data["metric_values"])
-                avg_percent_change = sum(data["percent_changes"]) / len(data["percent_changes"])
-                
-                # Find top performing change this week
-                top_change_idx = data["percent_changes"].index(max(data["percent_changes"]))
-                top_change = data["changes"][top_change_idx]
+        if change_index.size:
+            # Calculate weekly averages and identify top performing changes, one pass per column
+            starts = np.flatnonzero(np.r_[True, week[1:] != week[:-1]])
+            counts = np.diff(np.r_[starts, week.size])
+            avg_values = np.add.reduceat(after_values, starts) / counts
+            avg_percent_changes = np.add.reduceat(percent_changes, starts) / counts
+            
+            # First row of each segment holding the segment maximum
+            weekly_max = np.maximum.reduceat(percent_changes, starts)
+            max_rows = np.flatnonzero(percent_changes == np.repeat(weekly_max, counts))
+            top_rows = max_rows[np.searchsorted(max_rows, starts)]
+            
+            for segment in reversed(range(starts.size)):
+                top_row = top_rows[segment]
+                top_change = changes[change_index[top_row]]
                 
                 trend_analysis.append({
-                    "week": week,
-                    "avg_value": avg_value,
-                    "avg_percent_change": avg_percent_change,
-                    "change_count": len(data["changes"]),
+                    "week": week_names[week[starts[segment]]],
+                    "avg_value": float(avg_values[segment]),
+                    "avg_percent_change": float(avg_percent_changes[segment]),
+                    "change_count": int(counts[segment]),
                     "top_change": {
-                        "category": top_change["category"],
-                        "description": top_change["description"],
-                        "percent_change": data["percent_changes"][top_change_idx]
+                        "category": top_change.category,
+                        "description": top_change.description,
+                        "percent_change": float(percent_changes[top_row])
                     }
                 })
         
@@ -261,31 +286,24 @@ class ChangeAnalyzer:
         if not category_changes:
             return {"error": f"No changes found in category '{category}'"}
         
-        # Calculate metrics impact statistics
-        metrics_impact = {
-            "revenue": [],
-            "dau": [],
-            "retention": [],
-            "session_length": [],
-            "conversion_rate": []
-        }
+        # Calculate metrics impact statistics from the repository's metric columns,
+        # selecting the measurements of this category's changes
+        positions = np.array(self.index_builder.category_index[category], dtype=np.intp)
         
-        for result in category_changes:
-            for metric in result["metrics"]:
-                metrics_impact[metric["metric_name"]].append(metric["percent_change"])
-        
-        # Calculate statistics
         metrics_stats = {}
-        for metric_name, impacts in metrics_impact.items():
-            if impacts:
+        for metric_name in METRIC_NAMES:
+            columns = self.knowledge_repo.get_metric_columns(metric_name)
+            impacts = columns["percent_change"][np.isin(columns["change_index"], positions)]
+            
+            if impacts.size:
                 metrics_stats[metric_name] = {
-                    "average": sum(impacts) / len(impacts),
-                    "min": min(impacts),
-                    "max": max(impacts),
-                    "positive_count": sum(1 for i in impacts if i > 0),
-                    "negative_count": sum(1 for i in impacts if i < 0),
-                    "neutral_count": sum(1 for i in impacts if -1 <= i <= 1),
-                    "total_count": len(impacts)
+                    "average": float(impacts.mean()),
+                    "min": float(impacts.min()),
+                    "max": float(impacts.max()),
+                    "positive_count": int(np.count_nonzero(impacts > 0)),
+                    "negative_count": int(np.count_nonzero(impacts < 0)),
+                    "neutral_count": int(np.count_nonzero((impacts >= -1) & (impacts <= 1))),
+                    "total_count": int(impacts.size)
                 }
         
         # Use LLM to generate insights if available
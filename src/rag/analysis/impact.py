@@ -0,0 +1,36 @@
+"""
+Vectorized classification of metric impacts.
+"""
+
+from typing import Sequence, Tuple
+import numpy as np
+
+# Percent change beyond which a metric counts as increased or decreased
+IMPACT_THRESHOLD = 5.0
+
+def classify_impacts(
+    percent_changes: Sequence[float],
+    expected_impacts: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bucket percent changes into actual impacts and compare them to expectations.
+    
+    Args:
+        percent_changes: Percent change of each metric
+        expected_impacts: Expected impact ("increase", "decrease" or "neutral") of each metric
+    
+    Returns:
+        Tuple of (actual_impacts, matched_expectation) arrays, one entry per metric
+    """
+    percent_changes = np.asarray(percent_changes, dtype=np.float64)
+    expected_impacts = np.asarray(expected_impacts, dtype=str)
+    
+    actual_impacts = np.where(
+        percent_changes > IMPACT_THRESHOLD,
+        "increase",
+        np.where(percent_changes < -IMPACT_THRESHOLD, "decrease", "neutral")
+    )
+    matched_expectation = (expected_impacts == actual_impacts) | (
+        (expected_impacts == "neutral") & (np.abs(percent_changes) <= IMPACT_THRESHOLD)
+    )
+    
+    return actual_impacts, matched_expectation
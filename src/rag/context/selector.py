@@ -3,7 +3,9 @@ Context selection module for the enhanced RAG system.
 Selects and prioritizes context based on intent analysis and configuration rules.
 """
 
+import heapq
 import json
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
@@ -160,25 +162,45 @@ class ContextSelector:
         
         changes = self.index_builder.search_by_category(category)
         
-        # Filter by time window and limit
-        recent_changes = [
-            change for change in changes
-            if (change["change"].timestamp if isinstance(change, dict) else change.timestamp) >= time_window["start"]
-        ][:max_items]
+        # Filter by time window and limit, stopping once max_items are found
+        recent_changes = list(islice(
+            (
+                change for change in changes
+                if (change["change"].timestamp if isinstance(change, dict) else change.timestamp) >= time_window["start"]
+            ),
+            max_items
+        ))
         
         # Convert changes to dictionaries for serialization
+        serializable_changes = self._serialize_changes(recent_changes)
+        
+        return serializable_changes if serializable_changes else None
+    
+    @staticmethod
+    def _serialize_changes(changes: List[Any]) -> List[Dict[str, Any]]:
+        """Convert index search results to dictionaries for serialization.
+        
+        Args:
+            changes: Result dicts holding a LiveOpsChange object, or LiveOpsChange objects
+            
+        Returns:
+            List of result dicts with the change converted to a dictionary
+        """
         serializable_changes = []
-        for change in recent_changes:
+        append = serializable_changes.append
+        for change in changes:
             if isinstance(change, dict):
                 # If it's already a dict with a LiveOpsChange object
                 change_dict = change.copy()
                 change_dict["change"] = change["change"].to_dict()
-                serializable_changes.append(change_dict)
+                if "metrics" in change:
+                    # Copy the repository's shared read-only metric mappings
+                    change_dict["metrics"] = [dict(metric) for metric in change["metrics"]]
+                append(change_dict)
             else:
                 # If it's a LiveOpsChange object directly
-                serializable_changes.append({"change": change.to_dict()})
-        
-        return serializable_changes if serializable_changes else None
+                append({"change": change.to_dict()})
+        return serializable_changes
     
     def _get_metric_history(
         self,
@@ -222,16 +244,7 @@ class ContextSelector:
         
         if changes:
             # Convert changes to dictionaries for serialization
-            serializable_changes = []
-            for change in changes:
-                if isinstance(change, dict):
-                    change_dict = change.copy()
-                    change_dict["change"] = change["change"].to_dict()
-                    serializable_changes.append(change_dict)
-                else:
-                    serializable_changes.append({"change": change.to_dict()})
-            
-            return {"changes": serializable_changes}
+            return {"changes": self._serialize_changes(changes)}
         
         return None
     
@@ -254,14 +267,7 @@ class ContextSelector:
             changes = self.index_builder.search_by_category(target)
             
             # Convert changes to dictionaries for serialization
-            serializable_changes = []
-            for change in changes:
-                if isinstance(change, dict):
-                    change_dict = change.copy()
-                    change_dict["change"] = change["change"].to_dict()
-                    serializable_changes.append(change_dict)
-                else:
-                    serializable_changes.append({"change": change.to_dict()})
+            serializable_changes = self._serialize_changes(changes)
             
             metrics_data = {
                 metric: self.knowledge_repo.get_metric_history(
@@ -295,23 +301,16 @@ class ContextSelector:
         
         # Filter to most impactful changes
         if changes:
-            # Sort by the number of impacted metrics as a simple impact score
-            changes.sort(
-                key=lambda x: len(x["change"].expected_impact if isinstance(x, dict) else x.expected_impact),
-                reverse=True
+            # Select by the number of impacted metrics as a simple impact score,
+            # without sorting every change in the window
+            top_changes = heapq.nlargest(
+                max_items,
+                changes,
+                key=lambda x: len(x["change"].expected_impact if isinstance(x, dict) else x.expected_impact)
             )
             
             # Convert changes to dictionaries for serialization
-            serializable_changes = []
-            for change in changes[:max_items]:
-                if isinstance(change, dict):
-                    change_dict = change.copy()
-                    change_dict["change"] = change["change"].to_dict()
-                    serializable_changes.append(change_dict)
-                else:
-                    serializable_changes.append({"change": change.to_dict()})
-            
-            return serializable_changes
+            return self._serialize_changes(top_changes)
         
         return None
     
@@ -340,10 +339,13 @@ class ContextSelector:
         # Use the RAG system's search_similar_changes method
         # Note: We'll need to pass this in from the RAG system
         if hasattr(self, "rag_system"):
-            similar = self.rag_system.search_similar_changes(
-                intent_analysis.get("query", ""),
-                max_items
-            )
+            similar = [
+                result.to_dict()
+                for result in self.rag_system.search_similar_changes(
+                    intent_analysis.get("query", ""),
+                    max_items
+                )
+            ]
         else:
             # Fallback to basic category search if RAG system not available
             category = next(
@@ -1,7 +1,10 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Mapping
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 import numpy as np
 
+from src.data.models import LiveOpsChange, MetricMeasurement
 from src.data.repository import KnowledgeRepository
 from src.llm.service import LLMService
 from src.llm.token_counter import TokenCounter
@@ -10,14 +13,67 @@ from src.rag.domain_knowledge.context import DomainKnowledgeManager
 from src.rag.analysis.analyzer import ChangeAnalyzer
 from src.rag.intent.analyzer import IntentAnalyzer
 from src.rag.context.selector import ContextSelector
-from src.rag.embeddings.models import create_embedding_model
+from src.rag.embeddings.models import EmbeddingModel, create_embedding_model
+from src.rag.embeddings.change_index import ChangeEmbeddingIndex
+
+@dataclass(slots=True, frozen=True)
+class SimilarChange:
+    """A change returned by similarity search, with its metrics and score."""
+    change: LiveOpsChange
+    metrics: Tuple[Mapping[str, Any], ...]
+    similarity_score: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the nested dictionary form used in LLM context."""
+        return {
+            "change": {"change": self.change.to_dict()},
+            "metrics": [dict(metric) for metric in self.metrics],
+            "similarity_score": self.similarity_score
+        }
+
+def _category_insight(intent_analysis: Dict[str, Any], context: Dict[str, Any]) -> Optional[str]:
+    """Summarize average metric impacts of a category, if its performance was selected."""
+    performance = context.get("category_performance")
+    if performance is None or "metrics_stats" not in performance:
+        return None
+    
+    category = intent_analysis["entities"].get("category", [""])[0]
+    metrics_text = []
+    for metric, stats in performance["metrics_stats"].items():
+        direction = "increased" if stats["average"] > 0 else "decreased"
+        metrics_text.append(f"{metric} {direction} by an average of {abs(stats['average']):.2f}%")
+    
+    return f"Analysis of {category} changes:\n\n" + "\n".join(metrics_text)
+
+def _metric_trend_insight(intent_analysis: Dict[str, Any], context: Dict[str, Any]) -> Optional[str]:
+    """Summarize a metric's trend periods, if its history was selected."""
+    history = context.get("metric_history")
+    if history is None or "trend_analysis" not in history:
+        return None
+    
+    metric = intent_analysis["entities"].get("metric", [""])[0]
+    trend_text = []
+    for period in history["trend_analysis"]:
+        trend_text.append(f"{period['period']}: {period['percent_change']:.2f}% change")
+    
+    return f"Trend analysis for {metric}:\n\n" + "\n".join(trend_text)
 
 class EnhancedRAGSystem:
+    # Number of recent similarity search results kept in memory
+    SEARCH_CACHE_SIZE = 256
+    
+    # Basic (non-LLM) insight builder for each intent type
+    BASIC_INSIGHT_HANDLERS = {
+        "category_analysis": _category_insight,
+        "metric_trend": _metric_trend_insight
+    }
+    
     def __init__(
         self,
         knowledge_repo: KnowledgeRepository,
         llm_service: Optional[LLMService] = None,
-        config_dir: str = "config"
+        config_dir: str = "config",
+        embedding_model: Optional[EmbeddingModel] = None
     ):
         """Initialize the RAG system with a knowledge repository and optional LLM service.
         
@@ -25,13 +81,23 @@ class EnhancedRAGSystem:
             knowledge_repo: Repository containing changes and metrics
             llm_service: Optional LLM service for generating insights
             config_dir: Directory containing configuration files
+            embedding_model: Optional embedding model to share between instances
+                (defaults to a local all-MiniLM-L6-v2 model)
         """
         self.knowledge_repo = knowledge_repo
         self.llm_service = llm_service
         self.config_dir = config_dir
         
         # Initialize embedding model
-        self.embedding_model = create_embedding_model("local", "all-MiniLM-L6-v2")
+        self.embedding_model = embedding_model or create_embedding_model("local", "all-MiniLM-L6-v2")
+        
+        # Serve repeated identical LLM requests from a response cache
+        if llm_service is not None and llm_service.response_cache is None:
+            llm_service.enable_response_cache()
+        
+        # Change description embeddings, built on first similarity search
+        self.change_index = ChangeEmbeddingIndex(self.embedding_model)
+        self._search_cache: OrderedDict[Tuple[str, int, int], Tuple[np.ndarray, np.ndarray]] = OrderedDict()
         
         # Initialize components
         self.index_builder = IndexBuilder(knowledge_repo)
@@ -84,6 +150,27 @@ class EnhancedRAGSystem:
         else:
             return self._generate_basic_insight(intent_analysis, context)
     
+    def stream_insight(self, query: str) -> Iterator[str]:
+        """Generate an insight like ``generate_insight``, yielding text as it is produced.
+        
+        Args:
+            query: The query to analyze
+            
+        Returns:
+            Iterator over chunks of the generated insight
+        """
+        intent_analysis = self.intent_analyzer.analyze(query)
+        context = self.context_selector.select_context(query, intent_analysis)
+        
+        if self.llm_service and self.llm_service.is_enabled:
+            yield from self.llm_service.stream_answer_query(
+                query=query,
+                intent_analysis=intent_analysis,
+                context=context
+            )
+        else:
+            yield self._generate_basic_insight(intent_analysis, context)
+    
     def _generate_basic_insight(
         self,
         intent_analysis: Dict[str, Any],
@@ -98,34 +185,28 @@ class EnhancedRAGSystem:
         Returns:
             Basic insight based on available data
         """
-        intent_type = intent_analysis["intent_type"]
-        
-        if intent_type == "category_analysis" and "category_performance" in context:
-            category = intent_analysis["entities"].get("category", [""])[0]
-            performance = context["category_performance"]
-            
-            if "metrics_stats" in performance:
-                metrics_text = []
-                for metric, stats in performance["metrics_stats"].items():
-                    direction = "increased" if stats["average"] > 0 else "decreased"
-                    metrics_text.append(f"{metric} {direction} by an average of {abs(stats['average']):.2f}%")
-                
-                return f"Analysis of {category} changes:\n\n" + "\n".join(metrics_text)
-        
-        elif intent_type == "metric_trend" and "metric_history" in context:
-            metric = intent_analysis["entities"].get("metric", [""])[0]
-            history = context["metric_history"]
-            
-            if "trend_analysis" in history:
-                trend_text = []
-                for period in history["trend_analysis"]:
-                    trend_text.append(f"{period['period']}: {period['percent_change']:.2f}% change")
-                
-                return f"Trend analysis for {metric}:\n\n" + "\n".join(trend_text)
+        handler = self.BASIC_INSIGHT_HANDLERS.get(intent_analysis["intent_type"])
+        insight = handler(intent_analysis, context) if handler else None
+        if insight is not None:
+            return insight
         
         # Default response
         return "To get detailed insights, please configure the LLM service by setting the API key."
     
+    def add_change(self, change: LiveOpsChange, metrics: Optional[List[MetricMeasurement]] = None) -> None:
+        """Add a new change and its metrics, updating indexes incrementally.
+        
+        Args:
+            change: The change to add
+            metrics: Metric measurements for the change
+        """
+        self.knowledge_repo.add_change(change)
+        for metric in metrics or []:
+            self.knowledge_repo.add_metric(metric)
+        
+        # Change embeddings are picked up by the next similarity search
+        self.index_builder.sync()
+    
     def analyze_change_impact(self, change_id: str) -> Dict:
         """Analyze the impact of a specific change."""
         return self.analyzer.analyze_change_impact(change_id)
@@ -158,7 +239,7 @@ class EnhancedRAGSystem:
         """Get relevant domain context for a query."""
         return self.domain_manager.get_context_for_query(query, intent)
     
-    def search_similar_changes(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def search_similar_changes(self, query: str, top_k: int = 5) -> List[SimilarChange]:
         """Find changes similar to the query using semantic search.
         
         Args:
@@ -168,29 +249,33 @@ class EnhancedRAGSystem:
         Returns:
             List of similar changes with their similarity scores
         """
-        # Get query embedding
-        query_embedding = self.embedding_model.embed(query)
-        
-        # Get embeddings for all changes
-        changes = []
-        for change in self.knowledge_repo.changes:
-            if not hasattr(change, 'vector_embedding') or change.vector_embedding is None:
-                # Generate embedding if not already present
-                change.vector_embedding = self.embedding_model.embed(change.description)
-            
-            # Calculate similarity
-            similarity = float(np.dot(query_embedding, change.vector_embedding))
+        changes = self.knowledge_repo.changes
+        
+        # The embedding model is uncased and ignores extra whitespace, so queries
+        # differing only in those respects share a cache entry
+        cache_key = (" ".join(query.lower().split()), top_k, len(changes))
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            top_indices, top_scores = cached
+        else:
+            # Get query embedding
+            query_embedding = self.embedding_model.embed(query)
             
-            # Convert change to dictionary and get metrics
-            change_dict = change.to_dict()
-            metrics = self.knowledge_repo.get_metrics_for_change(change_dict["change_id"])
+            # Score all changes at once, embedding any new ones first
+            self.change_index.sync(changes)
+            top_indices, top_scores = self.change_index.search(query_embedding, top_k)
             
-            changes.append({
-                "change": {"change": change_dict},  # Match the expected structure in search.py
-                "metrics": metrics,
-                "similarity_score": similarity
-            })
-        
-        # Sort by similarity and return top_k
-        changes.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return changes[:top_k]
+            self._search_cache[cache_key] = (top_indices, top_scores)
+            if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        
+        # Build results only for the top_k changes
+        return [
+            SimilarChange(
+                change=changes[idx],
+                metrics=self.knowledge_repo.get_metrics_for_change(changes[idx].change_id),
+                similarity_score=similarity
+            )
+            for idx, similarity in zip(top_indices.tolist(), top_scores.tolist())
+        ]
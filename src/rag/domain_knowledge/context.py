@@ -1,8 +1,12 @@
 from typing import Dict, Any
 
+from src.rag.keyword_matcher import KeywordMatcher
+
 class DomainKnowledgeManager:
     def __init__(self):
         self.domain_context = self._build_domain_context()
+        # Finds every concept mentioned in a text with a single scan
+        self._concept_matcher = KeywordMatcher(self.domain_context["concepts"])
     
     def _build_domain_context(self) -> Dict[str, Any]:
         """Build domain context to improve LLM understanding."""
@@ -42,14 +46,14 @@ class DomainKnowledgeManager:
     
     def get_relevant_concepts(self, query: str) -> Dict[str, str]:
         """Get concepts relevant to a specific query."""
-        query_lower = query.lower()
-        relevant_concepts = {}
-        
-        for concept, description in self.domain_context["concepts"].items():
-            if concept.lower() in query_lower:
-                relevant_concepts[concept] = description
+        matched = self._concept_matcher.find_all(query)
         
-        return relevant_concepts
+        # Keep the configured concept order
+        return {
+            concept: description
+            for concept, description in self.domain_context["concepts"].items()
+            if concept in matched
+        }
     
     def get_relevant_category_context(self, category: str) -> str:
         """Get context for a specific category."""
@@ -6,11 +6,13 @@ This module provides components for:
 - Vector storage and retrieval
 - Text processing utilities
 - Hybrid search implementation
+- Similarity index over repository changes
 """
 
 from .models import EmbeddingModel
 from .vectorstore import VectorStore
 from .processor import TextProcessor
 from .hybrid import HybridSearcher
+from .change_index import ChangeEmbeddingIndex
 
-__all__ = ['EmbeddingModel', 'VectorStore', 'TextProcessor', 'HybridSearcher']
+__all__ = ['EmbeddingModel', 'VectorStore', 'TextProcessor', 'HybridSearcher', 'ChangeEmbeddingIndex']
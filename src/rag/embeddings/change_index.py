@@ -0,0 +1,93 @@
+"""
+Dense embedding index over repository changes.
+"""
+
+from typing import List, Tuple
+import numpy as np
+
+from src.data.models import LiveOpsChange
+from .models import EmbeddingModel
+
+class ChangeEmbeddingIndex:
+    """Keeps the embeddings of all change descriptions in one contiguous matrix.
+    
+    Changes are embedded in batches as they are added to the repository, and a
+    query is scored against every change with a single matrix-vector product.
+    The repository only appends changes, so rows stay aligned with
+    ``KnowledgeRepository.changes``.
+    
+    Scores are cosine similarities. Row norms are computed once when changes are
+    added, so embedding models that do not normalize their output only cost one
+    extra ``vdot`` for the query.
+    """
+    
+    def __init__(self, embedding_model: EmbeddingModel):
+        """Initialize an empty index.
+        
+        Args:
+            embedding_model: Model used to embed change descriptions
+        """
+        self.embedding_model = embedding_model
+        self.embeddings = np.empty((0, embedding_model.dimension), dtype=np.float32)
+        self._inverse_norms = np.empty(0, dtype=np.float32)
+    
+    def sync(self, changes: List[LiveOpsChange]) -> None:
+        """Embed any changes added since the last sync.
+        
+        Args:
+            changes: All repository changes, in repository order
+        """
+        new_changes = changes[len(self.embeddings):]
+        if not new_changes:
+            return
+        
+        # Embed descriptions that do not have an embedding yet in one batch
+        missing = [change for change in new_changes if change.vector_embedding is None]
+        if missing:
+            vectors = self.embedding_model.embed([change.description for change in missing])
+            for change, vector in zip(missing, vectors):
+                change.vector_embedding = vector
+        
+        new_rows = np.vstack([change.vector_embedding for change in new_changes]).astype(np.float32, copy=False)
+        self.embeddings = np.vstack([self.embeddings, new_rows])
+        
+        norms = np.sqrt(np.einsum("ij,ij->i", new_rows, new_rows))
+        inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        self._inverse_norms = np.concatenate([self._inverse_norms, inverse_norms])
+    
+    def search(self, query_embedding: np.ndarray, top_k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the changes most similar to a query.
+        
+        Args:
+            query_embedding: Query embedding
+            top_k: Number of results to return
+        
+        Returns:
+            Tuple of (indices, scores) sorted by descending similarity
+        """
+        num_changes = len(self.embeddings)
+        k = min(top_k, num_changes)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        
+        # Normalize the query (D floats) rather than the scores (N floats), and
+        # scale by the row norms in place so the scan allocates a single array
+        query_norm = np.sqrt(np.vdot(query, query))
+        if query_norm > 0:
+            query = query / query_norm
+        scores = self.embeddings @ query
+        np.multiply(scores, self._inverse_norms, out=scores)
+        
+        # Select the top k without sorting every score, then order just those
+        if k < num_changes:
+            top_indices = np.argpartition(scores, num_changes - k)[num_changes - k:]
+        else:
+            top_indices = np.arange(num_changes)
+        top_indices = top_indices[np.argsort(scores[top_indices], kind="stable")[::-1]]
+        
+        return top_indices, scores[top_indices]
+    
+    def __len__(self) -> int:
+        return len(self.embeddings)
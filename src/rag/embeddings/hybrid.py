@@ -3,12 +3,16 @@ Hybrid search implementation combining semantic and keyword-based search.
 """
 
 from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+from functools import lru_cache
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.utils import murmurhash3_32
 from dataclasses import dataclass
 
 from .models import EmbeddingModel
-from .vectorstore import Document, VectorStore
+from .vectorstore import Document, VectorStore, top_k_indices
 
 @dataclass
 class SearchResult:
@@ -46,23 +50,68 @@ class HybridSearcher:
         self.semantic_weight = semantic_weight
         self.keyword_weight = keyword_weight
         
-        # Initialize TF-IDF vectorizer for keyword search
-        self.vectorizer = TfidfVectorizer(
+        # Keyword search uses hashed term counts rather than a fitted vocabulary,
+        # so documents added to the store are counted without re-counting the
+        # others and only the IDF weights are refit. Values are float32 and
+        # sublinear TF damps repeated terms.
+        self.hasher = HashingVectorizer(
             lowercase=True,
             strip_accents='unicode',
-            ngram_range=(1, 2)  # Use unigrams and bigrams
+            ngram_range=(1, 2),  # Use unigrams and bigrams
+            n_features=2 ** 18,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32
         )
+        self.transformer = TfidfTransformer(sublinear_tf=True)
+        self._counts = None
+        self._last_counted_id = None
+        self._seen_columns = None
         self._tfidf_matrix = None
         self._needs_refresh = True
+        
+        # Query tokenization and hashing do not depend on the documents, so they
+        # are memoized across refreshes
+        self._analyzer = self.hasher.build_analyzer()
+        self._query_columns = lru_cache(maxsize=1024)(
+            lambda query: tuple(self._hash_term(term) for term in self._analyzer(query))
+        )
+    
+    def _hash_term(self, term: str) -> int:
+        """Column of a term in the hashed feature space, as used by ``hasher``."""
+        return abs(murmurhash3_32(term, seed=0)) % self.hasher.n_features
     
     def _refresh_tfidf(self) -> None:
         """Update TF-IDF matrix if needed."""
         if self._needs_refresh:
-            if not self.vector_store.documents:
+            documents = self.vector_store.documents
+            if not documents:
+                self._counts = None
                 self._tfidf_matrix = None
             else:
-                texts = [doc.text for doc in self.vector_store.documents]
-                self._tfidf_matrix = self.vectorizer.fit_transform(texts)
+                # Count only documents added since the last refresh, unless the
+                # store was cleared or replaced in the meantime
+                num_counted = 0 if self._counts is None else self._counts.shape[0]
+                if num_counted > len(documents) or (
+                    num_counted and documents[num_counted - 1].id != self._last_counted_id
+                ):
+                    num_counted = 0
+                
+                if num_counted < len(documents):
+                    # Stream document texts into the hasher without building a list
+                    new_counts = self.hasher.transform(doc.text for doc in documents[num_counted:])
+                    self._counts = new_counts if num_counted == 0 else sp.vstack(
+                        [self._counts, new_counts], format="csr"
+                    )
+                    self._last_counted_id = documents[-1].id
+                
+                # Columns of terms that occur in some document, like a fitted vocabulary
+                self._seen_columns = np.bincount(
+                    self._counts.indices, minlength=self.hasher.n_features
+                ).astype(bool)
+                
+                # Stored column-major so a query only touches the columns of its terms
+                self._tfidf_matrix = self.transformer.fit_transform(self._counts).tocsc()
             self._needs_refresh = False
     
     def _compute_keyword_scores(self, query: str) -> np.ndarray:
@@ -78,9 +127,44 @@ class HybridSearcher:
         if self._tfidf_matrix is None:
             return np.array([])
         
-        # Transform query and compute similarities
-        query_vector = self.vectorizer.transform([query])
-        return (self._tfidf_matrix @ query_vector.T).toarray().flatten()
+        # Transform query and compute similarities over the query's terms only
+        columns, weights = self._transform_query(query)
+        if not columns.size:
+            return np.zeros(self._tfidf_matrix.shape[0], dtype=self._tfidf_matrix.dtype)
+        return self._tfidf_matrix[:, columns] @ weights
+    
+    def _transform_query(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Build the sparse TF-IDF vector for a query.
+        
+        Equivalent to ``transformer.transform(hasher.transform([query]))`` with
+        terms that occur in no document dropped, as a fitted vocabulary would,
+        but reuses memoized term columns and skips sparse matrix setup.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Tuple of (columns, weights) for the query terms seen in the documents
+        """
+        counts = Counter(
+            column for column in self._query_columns(query) if self._seen_columns[column]
+        )
+        
+        columns = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=self._tfidf_matrix.dtype, count=len(counts))
+        if not counts:
+            return columns, weights
+        
+        if self.transformer.sublinear_tf:
+            weights = np.log(weights) + 1
+        if self.transformer.use_idf:
+            weights = weights * self.transformer.idf_[columns]
+        if self.transformer.norm == "l2":
+            weights = weights / np.sqrt(np.dot(weights, weights))
+        elif self.transformer.norm == "l1":
+            weights = weights / np.abs(weights).sum()
+        
+        return columns, weights
     
     def search(
         self,
@@ -100,63 +184,53 @@ class HybridSearcher:
         Returns:
             List of SearchResult objects, sorted by combined score
         """
-        # Get semantic search results for all documents
+        # Get semantic scores for all documents, aligned with the document list
         query_embedding = self.embedding_model.embed(query)
-        semantic_results = self.vector_store.similarity_search(
-            query_embedding,
-            k=len(self.vector_store.documents),
-            score_threshold=None
-        )
-        
-        # Create mapping of document ID to semantic score
-        semantic_scores = {doc.id: score for doc, score in semantic_results}
+        semantic_scores = self.vector_store.similarity_scores(query_embedding)
         
         # Get keyword search scores
         keyword_scores = self._compute_keyword_scores(query)
         
-        # Combine scores for all documents
-        results = []
-        for doc, keyword_score in zip(self.vector_store.documents, keyword_scores):
-            # Get semantic score (default to 0 if not in top results)
-            semantic_score = semantic_scores.get(doc.id, 0.0)
-            # Normalize keyword score to 0-1 range if needed
-            keyword_score = float(keyword_score)
-            if keyword_score > 1.0:
-                keyword_score = keyword_score / (1.0 + keyword_score)  # Soft normalization
-            
-            # Include if either score is significant
-            if semantic_score > 0.01 or keyword_score > 0.01:
-                # Compute combined score
-                combined_score = (
-                    self.semantic_weight * semantic_score +
-                    self.keyword_weight * keyword_score
+        if not semantic_scores.size:
+            return []
+        
+        # Normalize keyword scores to 0-1 range if needed (soft normalization)
+        keyword_scores = np.asarray(keyword_scores, dtype=np.float64)
+        keyword_scores = np.where(keyword_scores > 1.0, keyword_scores / (1.0 + keyword_scores), keyword_scores)
+        semantic_scores = semantic_scores.astype(np.float64)
+        
+        # Combine scores for all documents at once
+        combined_scores = self.semantic_weight * semantic_scores + self.keyword_weight * keyword_scores
+        
+        # Include documents where either score is significant, above the threshold
+        mask = (semantic_scores > 0.01) | (keyword_scores > 0.01)
+        if score_threshold is not None:
+            mask &= combined_scores >= score_threshold
+        candidates = np.flatnonzero(mask)
+        
+        # Apply metadata filters to the remaining candidates only
+        if metadata_filters:
+            documents = self.vector_store.documents
+            candidates = np.array([
+                i for i in candidates.tolist()
+                if all(
+                    key in documents[i].metadata and documents[i].metadata[key] == value
+                    for key, value in metadata_filters.items()
                 )
-                
-                # Apply score threshold
-                if score_threshold is not None and combined_score < score_threshold:
-                    continue
-                
-                # Apply metadata filters
-                if metadata_filters:
-                    matches = True
-                    for key, value in metadata_filters.items():
-                        if key not in doc.metadata or doc.metadata[key] != value:
-                            matches = False
-                            break
-                    if not matches:
-                        continue
-                
-                results.append(SearchResult(
-                    document=doc,
-                    semantic_score=semantic_score,
-                    keyword_score=keyword_score,
-                    combined_score=combined_score
-                ))
+            ], dtype=np.intp)
         
-        # Sort by combined score
-        results.sort(key=lambda x: x.combined_score, reverse=True)
+        # Select the top k by combined score without sorting every candidate
+        top_indices = candidates[top_k_indices(combined_scores[candidates], k)]
         
-        return results[:k]
+        return [
+            SearchResult(
+                document=self.vector_store.documents[i],
+                semantic_score=float(semantic_scores[i]),
+                keyword_score=float(keyword_scores[i]),
+                combined_score=float(combined_scores[i])
+            )
+            for i in top_indices.tolist()
+        ]
     
     def adjust_weights(
         self,
@@ -8,6 +8,23 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, in descending order of score.
+    
+    Finds the k-th highest score in linear time with ``partition`` and sorts only
+    the scores at or above it. Ties keep their original order, as with a stable
+    full sort.
+    """
+    n = scores.size
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        top = np.flatnonzero(scores >= np.partition(scores, n - k)[n - k])
+    else:
+        top = np.arange(n)
+    return top[np.argsort(-scores[top], kind="stable")][:k]
+
 @dataclass
 class Document:
     """Represents a document with its embedding and metadata."""
@@ -60,8 +77,12 @@ class VectorStore:
             if not self.documents:
                 self.embeddings = None
             else:
-                # Stack all embeddings into a single matrix
-                self.embeddings = np.vstack([doc.embedding for doc in self.documents])
+                # Stack all embeddings into a single contiguous float32 matrix with
+                # unit-length rows, so each search is a single matrix-vector product
+                embeddings = np.vstack([doc.embedding for doc in self.documents]).astype(np.float32)
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+                self.embeddings = embeddings
             self._needs_refresh = False
     
     def similarity_search(
@@ -80,25 +101,20 @@ class VectorStore:
         Returns:
             List of (document, score) tuples, sorted by descending similarity
         """
-        self._refresh_embeddings()
-        
-        if not self.documents or self.embeddings is None:
+        similarities = self.similarity_scores(query_embedding)
+        if not similarities.size:
             return []
         
-        # Compute cosine similarity
-        # Note: Embeddings are assumed to be L2-normalized
-        similarities = self.embeddings @ query_embedding
-        
         # Get top k indices
         if score_threshold is not None:
             # Filter by threshold first
             mask = similarities >= score_threshold
-            indices = np.argsort(similarities[mask])[-k:][::-1]
+            indices = top_k_indices(similarities[mask], k)
             # Map back to original indices
             top_indices = np.where(mask)[0][indices]
             top_scores = similarities[top_indices]
         else:
-            top_indices = np.argsort(similarities)[-k:][::-1]
+            top_indices = top_k_indices(similarities, k)
             top_scores = similarities[top_indices]
         
         # Return documents and scores
@@ -107,6 +123,27 @@ class VectorStore:
             for idx, score in zip(top_indices, top_scores)
         ]
     
+    def similarity_scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Compute the cosine similarity of the query to every document.
+        
+        Args:
+            query_embedding: Query vector to compare against
+            
+        Returns:
+            Array of similarity scores, aligned with ``documents``
+        """
+        self._refresh_embeddings()
+        
+        if not self.documents or self.embeddings is None:
+            return np.empty(0, dtype=np.float32)
+        
+        # Compute cosine similarity against the normalized document matrix
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm > 0:
+            query = query / query_norm
+        return self.embeddings @ query
+    
     def filter_by_metadata(
         self,
         filters: Dict[str, Any],
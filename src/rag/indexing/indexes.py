@@ -1,5 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
+from array import array
 from datetime import datetime
+import bisect
 from src.data.repository import KnowledgeRepository
 
 class IndexBuilder:
@@ -8,7 +10,10 @@ class IndexBuilder:
         self.category_index = {}
         self.metric_impact_index = {}
         self.temporal_index = []
+        self.sorted_timestamps = []
         self.tag_index = {}
+        # Number of repository changes the indexes cover
+        self._indexed_count = 0
         
         # Build all indexes
         self.build_all_indexes()
@@ -19,21 +24,22 @@ class IndexBuilder:
         self.build_metric_impact_index()
         self.build_temporal_index()
         self.build_tag_index()
+        self._indexed_count = len(self.knowledge_repo.changes)
     
     def build_category_index(self):
         """Build index for fast retrieval by category."""
         self.category_index = {}
         for i, change in enumerate(self.knowledge_repo.changes):
             if change.category not in self.category_index:
-                self.category_index[change.category] = []
+                self.category_index[change.category] = array("i")
             self.category_index[change.category].append(i)
     
     def build_metric_impact_index(self):
         """Build index for fast retrieval by metric impact."""
         self.metric_impact_index = {
-            "increase": {metric: [] for metric in ["revenue", "dau", "retention", "session_length", "conversion_rate"]},
-            "decrease": {metric: [] for metric in ["revenue", "dau", "retention", "session_length", "conversion_rate"]},
-            "neutral": {metric: [] for metric in ["revenue", "dau", "retention", "session_length", "conversion_rate"]}
+            "increase": {metric: array("i") for metric in ["revenue", "dau", "retention", "session_length", "conversion_rate"]},
+            "decrease": {metric: array("i") for metric in ["revenue", "dau", "retention", "session_length", "conversion_rate"]},
+            "neutral": {metric: array("i") for metric in ["revenue", "dau", "retention", "session_length", "conversion_rate"]}
         }
         
         for i, change in enumerate(self.knowledge_repo.changes):
@@ -47,6 +53,8 @@ class IndexBuilder:
             range(len(self.knowledge_repo.changes)),
             key=lambda i: self.knowledge_repo.changes[i].timestamp
         )
+        # Timestamps in temporal order, for binary search over date ranges
+        self.sorted_timestamps = [self.knowledge_repo.changes[i].timestamp for i in self.temporal_index]
         
         # Create weekly buckets for time-series analysis
         self.weekly_buckets = {}
@@ -54,7 +62,7 @@ class IndexBuilder:
             # Get year and week number
             year_week = change.timestamp.strftime("%Y-%U")
             if year_week not in self.weekly_buckets:
-                self.weekly_buckets[year_week] = []
+                self.weekly_buckets[year_week] = array("i")
             self.weekly_buckets[year_week].append(i)
     
     def build_tag_index(self):
@@ -63,70 +71,81 @@ class IndexBuilder:
         for i, change in enumerate(self.knowledge_repo.changes):
             for tag in change.tags:
                 if tag not in self.tag_index:
-                    self.tag_index[tag] = []
+                    self.tag_index[tag] = array("i")
                 self.tag_index[tag].append(i)
     
+    def add_change(self, index: int):
+        """Add one change to all indexes without rebuilding them.
+        
+        Call after ``KnowledgeRepository.add_change`` with the new change's position.
+        """
+        change = self.knowledge_repo.changes[index]
+        
+        self.category_index.setdefault(change.category, array("i")).append(index)
+        for metric, impact in change.expected_impact.items():
+            self.metric_impact_index[impact][metric].append(index)
+        for tag in change.tags:
+            self.tag_index.setdefault(tag, array("i")).append(index)
+        self.weekly_buckets.setdefault(change.timestamp.strftime("%Y-%U"), array("i")).append(index)
+        
+        # Insert after changes with the same timestamp, matching the stable sort
+        position = bisect.bisect_right(self.sorted_timestamps, change.timestamp)
+        self.temporal_index.insert(position, index)
+        self.sorted_timestamps.insert(position, change.timestamp)
+        self._indexed_count = max(self._indexed_count, index + 1)
+    
+    def sync(self):
+        """Index changes added to the repository since the indexes were built.
+        
+        The repository can be shared between several index builders (one per
+        app session), so a change added through one of them must still reach
+        the others before they read their indexes.
+        """
+        for index in range(self._indexed_count, len(self.knowledge_repo.changes)):
+            self.add_change(index)
+    
+    def _build_results(self, indices: Sequence[int]) -> List[Dict]:
+        """Pair the changes at the given positions with their metrics.
+        
+        Metrics come from the repository's per-change memo, so each lookup is a
+        dictionary read rather than a scan of all measurements.
+        """
+        changes = self.knowledge_repo.changes
+        get_metrics = self.knowledge_repo.get_metrics_for_change
+        return [
+            {"change": changes[idx], "metrics": get_metrics(changes[idx].change_id)}
+            for idx in indices
+        ]
+    
     def search_by_category(self, category: str) -> List[Dict]:
         """Find changes by exact category match."""
+        self.sync()
         if category not in self.category_index:
             return []
         
-        results = []
-        for idx in self.category_index[category]:
-            change = self.knowledge_repo.changes[idx]
-            metrics = self.knowledge_repo.get_metrics_for_change(change.change_id)
-            results.append({
-                "change": change,
-                "metrics": metrics
-            })
-        
-        return results
+        return self._build_results(self.category_index[category])
     
     def search_by_tag(self, tag: str) -> List[Dict]:
         """Find changes by tag."""
+        self.sync()
         if tag not in self.tag_index:
             return []
         
-        results = []
-        for idx in self.tag_index[tag]:
-            change = self.knowledge_repo.changes[idx]
-            metrics = self.knowledge_repo.get_metrics_for_change(change.change_id)
-            results.append({
-                "change": change,
-                "metrics": metrics
-            })
-        
-        return results
+        return self._build_results(self.tag_index[tag])
     
     def search_by_metric_impact(self, metric: str, impact: str) -> List[Dict]:
         """Find changes by expected impact on a specific metric."""
+        self.sync()
         if impact not in self.metric_impact_index or metric not in self.metric_impact_index[impact]:
             return []
         
-        results = []
-        for idx in self.metric_impact_index[impact][metric]:
-            change = self.knowledge_repo.changes[idx]
-            metrics = self.knowledge_repo.get_metrics_for_change(change.change_id)
-            results.append({
-                "change": change,
-                "metrics": metrics
-            })
-        
-        return results
+        return self._build_results(self.metric_impact_index[impact][metric])
     
     def search_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Dict]:
         """Find changes within a date range."""
-        results = []
-        for idx in self.temporal_index:
-            change = self.knowledge_repo.changes[idx]
-            if start_date <= change.timestamp <= end_date:
-                metrics = self.knowledge_repo.get_metrics_for_change(change.change_id)
-                results.append({
-                    "change": change,
-                    "metrics": metrics
-                })
-            elif change.timestamp > end_date:
-                # Since temporal_index is sorted, we can break early
-                break
+        self.sync()
+        # temporal_index is sorted, so binary search both ends of the range
+        start = bisect.bisect_left(self.sorted_timestamps, start_date)
+        end = bisect.bisect_right(self.sorted_timestamps, end_date)
         
-        return results
+        return self._build_results(self.temporal_index[start:end])
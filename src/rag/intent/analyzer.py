@@ -10,6 +10,11 @@ from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
 
 from src.rag.embeddings.models import EmbeddingModel
+from src.rag.keyword_matcher import KeywordMatcher
+
+# Substring cues used by the rule-based intent matcher
+COMPARISON_PATTERN = re.compile("compare|vs|versus")
+TREND_PATTERN = re.compile("trend|over time|changed|history")
 
 class IntentAnalyzer:
     """Analyzes queries to determine intent and extract entities."""
@@ -33,8 +38,24 @@ class IntentAnalyzer:
         self.intent_examples = self._load_json("intent/intent_examples.json")
         self.entity_types = self._load_json("entities/entity_types.json")
         
+        # Compile entity patterns once rather than on every query
+        self.entity_patterns = {
+            entity_type: [re.compile(pattern, re.IGNORECASE) for pattern in config.get("patterns", [])]
+            for entity_type, config in self.entity_types["entity_types"].items()
+        }
+        
+        # Find every configured value and alias of every entity type in one scan
+        self.entity_matcher = KeywordMatcher(
+            keyword
+            for config in self.entity_types["entity_types"].values()
+            for keyword in [*config.get("values", []), *config.get("aliases", {})]
+        )
+        
         # Initialize example embeddings if model available
         self.example_embeddings = {}
+        self._example_matrix = None
+        self._example_intents: List[str] = []
+        self._example_offsets = None
         if self.embedding_model:
             self._initialize_example_embeddings()
     
@@ -57,6 +78,15 @@ class IntentAnalyzer:
             queries = [ex["query"] for ex in examples]
             if queries:  # Only compute if we have examples
                 self.example_embeddings[intent_type] = self.embedding_model.embed(queries)
+        
+        # Stack all examples into one matrix so a query is scored with one product;
+        # offsets mark where each intent's rows start
+        if self.example_embeddings:
+            self._example_intents = list(self.example_embeddings)
+            self._example_matrix = np.vstack([self.example_embeddings[t] for t in self._example_intents])
+            self._example_offsets = np.cumsum(
+                [0] + [len(self.example_embeddings[t]) for t in self._example_intents[:-1]]
+            )
     
     def analyze(self, query: str) -> Dict[str, Any]:
         """Analyze a query to determine intent and extract entities.
@@ -97,26 +127,25 @@ class IntentAnalyzer:
             Dictionary of extracted entities by type
         """
         entities = {}
-        query_lower = query.lower()
+        matched = self.entity_matcher.find_all(query)
         
         for entity_type, config in self.entity_types["entity_types"].items():
             # Check for exact values first
             if "values" in config:
                 for value in config["values"]:
-                    if value.lower() in query_lower:
+                    if value in matched:
                         entities.setdefault(entity_type, []).append(value)
             
             # Check aliases
             if "aliases" in config:
                 for alias, value in config["aliases"].items():
-                    if alias.lower() in query_lower:
+                    if alias in matched:
                         entities.setdefault(entity_type, []).append(value)
             
             # Apply regex patterns
             if "patterns" in config:
-                for pattern in config["patterns"]:
-                    matches = re.finditer(pattern, query, re.IGNORECASE)
-                    for match in matches:
+                for pattern in self.entity_patterns[entity_type]:
+                    for match in pattern.finditer(query):
                         matched_text = match.group(0)
                         # Don't add if we already found this value
                         if entity_type not in entities or matched_text not in entities[entity_type]:
@@ -167,7 +196,7 @@ class IntentAnalyzer:
         query_lower = query.lower()
         
         # Check for comparison intent
-        if "comparison_targets" in entities or any(x in query_lower for x in ["compare", "vs", "versus"]):
+        if "comparison_targets" in entities or COMPARISON_PATTERN.search(query_lower):
             return ("comparative_analysis", 0.9)
         
         # Check for causal analysis
@@ -180,7 +209,7 @@ class IntentAnalyzer:
         
         # Check for metric trend
         if "metric" in entities:
-            if any(x in query_lower for x in ["trend", "over time", "changed", "history"]):
+            if TREND_PATTERN.search(query_lower):
                 return ("metric_trend", 0.9)
         
         # Check for category analysis
@@ -200,17 +229,13 @@ class IntentAnalyzer:
         """
         query_embedding = self.embedding_model.embed(query)
         
-        best_score = -1
-        best_intent = "general_query"
+        # Similarity to every example at once, then the best example per intent
+        similarities = self._example_matrix @ query_embedding
+        intent_scores = np.maximum.reduceat(similarities, self._example_offsets)
+        best = int(np.argmax(intent_scores))
         
-        for intent_type, examples_embedding in self.example_embeddings.items():
-            # Compute similarities to all examples of this intent
-            similarities = np.dot(examples_embedding, query_embedding)
-            max_similarity = float(np.max(similarities))
-            
-            if max_similarity > best_score:
-                best_score = max_similarity
-                best_intent = intent_type
+        best_score = float(intent_scores[best])
+        best_intent = self._example_intents[best]
         
         # Convert similarity score to confidence (similarity is in [-1, 1])
         confidence = (best_score + 1) / 2  # Convert to [0, 1]
@@ -0,0 +1,68 @@
+"""
+Multi-keyword matching for query text.
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text.
+    
+    Matching is case-insensitive substring matching, equivalent to checking
+    ``keyword.lower() in text.lower()`` for every keyword, but done in a single
+    scan of the text. All keywords are compiled into one regex alternation
+    (longest first) inside a lookahead, so each position reports the longest
+    keyword starting there; keywords that are prefixes of it are added from a
+    table built once at construction.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """Build the matcher.
+        
+        Args:
+            keywords: Keywords to look for (original casing is preserved in results)
+        """
+        self._originals: Dict[str, List[str]] = defaultdict(list)
+        for keyword in keywords:
+            self._originals[keyword.lower()].append(keyword)
+        
+        # The empty string is a substring of every text
+        self._always: List[str] = self._originals.pop("", [])
+        
+        lowered = sorted(self._originals, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(" + "|".join(map(re.escape, lowered)) + "))")
+            if lowered else None
+        )
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [other for other in lowered if keyword.startswith(other)]
+            for keyword in lowered
+        }
+    
+    def __len__(self) -> int:
+        return sum(len(originals) for originals in self._originals.values()) + len(self._always)
+    
+    def find_all(self, text: str) -> Set[str]:
+        """Find all keywords occurring in the text.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Set of matched keywords in their original casing
+        """
+        matched = set(self._always)
+        if self._pattern is None:
+            return matched
+        
+        seen = set()
+        for match in self._pattern.finditer(text.lower()):
+            longest = match.group(1)
+            if longest in seen:
+                continue
+            seen.add(longest)
+            for keyword in self._prefixes[longest]:
+                matched.update(self._originals[keyword])
+        
+        return matched
@@ -0,0 +1,14 @@
+"""
+Display formatting shared by the UI pages.
+"""
+
+def format_percent_change(value: float) -> str:
+    """Format a percent change with an explicit sign, e.g. "+3.20%" or "-1.05%".
+    
+    Args:
+        value: Percent change
+        
+    Returns:
+        Signed percentage with two decimals ("0.00%" for no change)
+    """
+    return f"{value:+.2f}%" if value else "0.00%"
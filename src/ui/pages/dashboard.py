@@ -1,9 +1,12 @@
 import streamlit as st
+import heapq
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta
+from collections import Counter
+from operator import attrgetter
 
 from src.rag.core import EnhancedRAGSystem
+from src.ui.components.formatting import format_percent_change
 
 def show_dashboard(rag_system: EnhancedRAGSystem):
     """Display the main analytics dashboard."""
@@ -14,13 +17,7 @@ def show_dashboard(rag_system: EnhancedRAGSystem):
     change_count = len(changes)
     
     # Generate category stats from dictionaries
-    categories = {}
-    for change in changes:
-        category = change["category"]
-        if category in categories:
-            categories[category] += 1
-        else:
-            categories[category] = 1
+    categories = Counter(change["category"] for change in changes)
     
     # Show stats
     st.subheader("Overall Statistics")
@@ -39,31 +36,28 @@ def show_dashboard(rag_system: EnhancedRAGSystem):
     fig = px.pie(category_df, values="Count", names="Category", title="Changes by Category")
     st.plotly_chart(fig)
     
-    # Show recent changes using dictionary data
+    # Show recent changes
     st.subheader("Recent Changes")
-    # Sort changes by timestamp (convert ISO string to datetime for sorting)
-    recent_changes = sorted(
-        changes,
-        key=lambda x: datetime.fromisoformat(x["timestamp"]),
-        reverse=True
-    )[:10]
+    # Select the 10 latest changes by their datetime timestamps, without
+    # parsing ISO strings or sorting every change
+    recent_changes = heapq.nlargest(
+        10,
+        rag_system.knowledge_repo.changes,
+        key=attrgetter("timestamp")
+    )
     
     recent_data = []
     for change in recent_changes:
-        # Get metrics as dictionaries
-        metrics = rag_system.knowledge_repo.get_metrics_for_change(change["change_id"])
-        # Find revenue impact from dictionary metrics
-        revenue_impact = next(
-            (m["percent_change"] for m in metrics if m["metric_name"] == "revenue"),
-            0
-        )
+        # Look up the revenue metric directly instead of scanning all metrics
+        revenue = rag_system.knowledge_repo.get_metric_for_change(change.change_id, "revenue")
+        revenue_impact = revenue["percent_change"] if revenue else 0
         
-        # Format data using dictionary access
+        # Format data for display
         recent_data.append({
-            "Date": datetime.fromisoformat(change["timestamp"]).strftime("%Y-%m-%d"),
-            "Category": change["category"],
-            "Description": change["description"],
-            "Revenue Impact": f"{'+' if revenue_impact > 0 else ''}{revenue_impact:.2f}%"
+            "Date": change.timestamp.date().isoformat(),
+            "Category": change.category,
+            "Description": change.description,
+            "Revenue Impact": format_percent_change(revenue_impact)
         })
     
     recent_df = pd.DataFrame(recent_data)
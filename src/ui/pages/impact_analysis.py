@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta
 
 from src.rag.core import EnhancedRAGSystem
 
@@ -15,25 +14,20 @@ def show_impact_analysis(rag_system: EnhancedRAGSystem):
         ["revenue", "dau", "retention", "session_length", "conversion_rate"]
     )
     
-    # Get all changes as dictionaries and generate dataframe with their impact
+    # Generate dataframe of all changes with their impact, reading fields
+    # straight from the change objects rather than an ISO round trip
     changes_data = []
     for change in rag_system.knowledge_repo.changes:
-        # Convert change to dictionary
-        change_dict = change.to_dict()
-        # Get metrics as dictionaries
-        metrics = rag_system.knowledge_repo.get_metrics_for_change(change_dict["change_id"])
         # Find the selected metric
-        impact = next((m for m in metrics if m["metric_name"] == metric), None)
+        impact = rag_system.knowledge_repo.get_metric_for_change(change.change_id, metric)
         
         if impact:
-            # Parse timestamp from ISO format
-            timestamp = datetime.fromisoformat(change_dict["timestamp"])
             changes_data.append({
-                "change_id": change_dict["change_id"],
-                "date": timestamp,  # Keep as datetime for sorting
-                "date_str": timestamp.strftime("%Y-%m-%d"),
-                "category": change_dict["category"],
-                "description": change_dict["description"],
+                "change_id": change.change_id,
+                "date": change.timestamp,  # Keep as datetime for sorting
+                "date_str": change.timestamp.date().isoformat(),
+                "category": change.category,
+                "description": change.description,
                 "before": impact["before_value"],
                 "after": impact["after_value"],
                 "percent_change": impact["percent_change"]
@@ -43,12 +37,9 @@ def show_impact_analysis(rag_system: EnhancedRAGSystem):
     
     # First part - showing top positive impact
     if not changes_df.empty:
-        # Sort by impact
-        changes_df = changes_df.sort_values(by="percent_change", ascending=False)
-        
-        # Show top positive impact
+        # Show top positive impact (partial selection, no full sort)
         st.subheader(f"Top Positive Impact on {metric.upper()}")
-        positive_df = changes_df.head(5)
+        positive_df = changes_df.nlargest(5, "percent_change")
         
         # Create a bar chart
         fig = px.bar(
@@ -66,7 +57,7 @@ def show_impact_analysis(rag_system: EnhancedRAGSystem):
         
         # Show bottom negative impact
         st.subheader(f"Bottom Negative Impact on {metric.upper()}")
-        negative_df = changes_df.tail(5).sort_values(by="percent_change")
+        negative_df = changes_df.nsmallest(5, "percent_change")
         
         # Create a bar chart
         fig = px.bar(
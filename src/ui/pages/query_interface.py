@@ -2,57 +2,62 @@ import streamlit as st
 from typing import List, Dict, Any
 
 from src.rag.core import EnhancedRAGSystem
+from src.rag.keyword_matcher import KeywordMatcher
+
+# Follow-ups for queries mentioning any of the given terms, checked in order
+FOLLOW_UP_RULES = [
+    (("revenue",), [
+        "How does this compare to last week's revenue performance?",
+        "Which user segments contributed most to this revenue?",
+        "What other metrics were affected by these same changes?"
+    ]),
+    (("retention",), [
+        "What's the correlation between these retention changes and revenue?",
+        "How have retention trends changed over the past month?",
+        "Which day of the week shows the best retention results?"
+    ]),
+    (("event", "pearly", "trident", "dealers edge"), [
+        "How do weekend events compare to weekday events?",
+        "What's the optimal duration for this type of event?",
+        "Which metrics are most improved by these events?"
+    ]),
+    (("slot",), [
+        "Which slot themes perform best for revenue?",
+        "What's the impact of slot positioning on engagement?",
+        "How does adding a new slot compare to running a BOGO sale?"
+    ]),
+    (("bogo", "sale"), [
+        "What's the optimal discount percentage for maximum revenue?",
+        "Do sales perform better on specific days of the week?",
+        "How do sales affect long-term metrics after they end?"
+    ]),
+    (("rtp", "adjustment"), [
+        "What's the relationship between RTP changes and session length?",
+        "Do RTP increases improve retention enough to offset revenue decreases?",
+        "Which slot types respond best to RTP adjustments?"
+    ])
+]
+
+# Base set of generic follow-ups
+GENERIC_FOLLOW_UPS = [
+    "How has this trend changed over time?",
+    "What are the top 3 factors influencing these results?",
+    "Can you recommend specific improvements based on this data?"
+]
+
+# Finds every rule term in a query with a single scan
+_follow_up_matcher = KeywordMatcher(term for terms, _ in FOLLOW_UP_RULES for term in terms)
 
 def generate_follow_up_suggestions(query: str) -> List[str]:
     """Generate contextual follow-up suggestions based on the query."""
-    query_lower = query.lower()
-    
-    # Base set of generic follow-ups
-    generic_follow_ups = [
-        "How has this trend changed over time?",
-        "What are the top 3 factors influencing these results?",
-        "Can you recommend specific improvements based on this data?"
-    ]
+    matched_terms = _follow_up_matcher.find_all(query)
     
     # Context-specific follow-ups
-    if "revenue" in query_lower:
-        return [
-            "How does this compare to last week's revenue performance?",
-            "Which user segments contributed most to this revenue?",
-            "What other metrics were affected by these same changes?"
-        ]
-    elif "retention" in query_lower:
-        return [
-            "What's the correlation between these retention changes and revenue?",
-            "How have retention trends changed over the past month?",
-            "Which day of the week shows the best retention results?"
-        ]
-    elif any(term in query_lower for term in ["event", "pearly", "trident", "dealers edge"]):
-        return [
-            "How do weekend events compare to weekday events?",
-            "What's the optimal duration for this type of event?",
-            "Which metrics are most improved by these events?"
-        ]
-    elif "slot" in query_lower or "add slot" in query_lower or "remove slot" in query_lower:
-        return [
-            "Which slot themes perform best for revenue?",
-            "What's the impact of slot positioning on engagement?",
-            "How does adding a new slot compare to running a BOGO sale?"
-        ]
-    elif "bogo" in query_lower or "sale" in query_lower:
-        return [
-            "What's the optimal discount percentage for maximum revenue?",
-            "Do sales perform better on specific days of the week?",
-            "How do sales affect long-term metrics after they end?"
-        ]
-    elif "rtp" in query_lower or "adjustment" in query_lower:
-        return [
-            "What's the relationship between RTP changes and session length?",
-            "Do RTP increases improve retention enough to offset revenue decreases?",
-            "Which slot types respond best to RTP adjustments?"
-        ]
-    else:
-        return generic_follow_ups
+    for terms, follow_ups in FOLLOW_UP_RULES:
+        if not matched_terms.isdisjoint(terms):
+            return follow_ups
+    
+    return GENERIC_FOLLOW_UPS
 
 def show_query_interface(rag_system: EnhancedRAGSystem):
     """Display the natural language query interface."""
@@ -63,6 +68,7 @@ def show_query_interface(rag_system: EnhancedRAGSystem):
         st.sidebar.metric("Total Tokens Used", f"{stats['total_tokens_sent']:,}")
         st.sidebar.metric("Queries Processed", stats['query_count'])
         st.sidebar.metric("Avg. Tokens/Query", f"{stats['avg_tokens_per_query']:.0f}")
+        st.sidebar.metric("Cached Prompt Tokens", f"{stats['cache_read_tokens']:,}")
         st.sidebar.divider()
     
     st.header("Natural Language Query Interface")
@@ -151,9 +157,12 @@ def show_query_interface(rag_system: EnhancedRAGSystem):
                 # Save current query as previous for context
                 st.session_state.previous_query = query
                 
-                # Display spinner while generating insight
-                with st.spinner("Adam is working on it..."):
-                    insight = rag_system.generate_insight(query)
+                # Stream the insight as it is generated, then clear the preview
+                # so the stored insight is rendered once below the form
+                preview = st.empty()
+                with preview.container():
+                    insight = st.write_stream(rag_system.stream_insight(query))
+                preview.empty()
                 
                 # Store the insight for displaying outside the form
                 st.session_state.current_insight = insight
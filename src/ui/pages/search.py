@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
 from src.rag.core import EnhancedRAGSystem
+from src.rag.analysis.impact import classify_impacts
+from src.ui.components.formatting import format_percent_change
 
 def show_search_interface(rag_system: EnhancedRAGSystem):
     """Display the search interface for finding similar changes."""
@@ -15,37 +16,33 @@ def show_search_interface(rag_system: EnhancedRAGSystem):
         similar_changes = rag_system.search_similar_changes(search_query)
         
         for i, result in enumerate(similar_changes):
-            change = result["change"]
-            metrics = result["metrics"]
+            change = result.change
+            metrics = result.metrics
             
-            # Get change data from dictionary
-            change_dict = change["change"]
-            timestamp = datetime.fromisoformat(change_dict["timestamp"])
-            
-            # Create an expander for each result using dictionary access
-            with st.expander(f"{i+1}. {change_dict['description']} ({change_dict['category']}) - {timestamp.strftime('%Y-%m-%d')}"):
-                st.write(f"**Category:** {change_dict['category']}")
-                st.write(f"**Tags:** {', '.join(change_dict['tags'])}")
+            # Create an expander for each result
+            with st.expander(f"{i+1}. {change.description} ({change.category}) - {change.timestamp.date().isoformat()}"):
+                st.write(f"**Category:** {change.category}")
+                st.write(f"**Tags:** {', '.join(change.tags)}")
                 
                 # Display expected vs actual impact
                 st.subheader("Impact Analysis")
                 
+                # Classify all metrics of the change at once
+                expected_impacts = [change.expected_impact.get(m["metric_name"], "neutral") for m in metrics]
+                _, matched_expectations = classify_impacts(
+                    [m["percent_change"] for m in metrics],
+                    expected_impacts
+                )
+                
                 impact_data = []
-                for metric in metrics:
-                    expected = change_dict["expected_impact"].get(metric["metric_name"], "neutral")
-                    actual = "neutral"
-                    if metric["percent_change"] > 5:
-                        actual = "increase"
-                    elif metric["percent_change"] < -5:
-                        actual = "decrease"
-                    
+                for metric, expected, matched in zip(metrics, expected_impacts, matched_expectations.tolist()):
                     impact_data.append({
                         "Metric": metric["metric_name"],
                         "Before": f"{metric['before_value']:.2f}",
                         "After": f"{metric['after_value']:.2f}",
-                        "Change": f"{'+' if metric['percent_change'] > 0 else ''}{metric['percent_change']:.2f}%",
+                        "Change": format_percent_change(metric["percent_change"]),
                         "Expected": expected,
-                        "Matched": "✓" if expected == actual or (expected == "neutral" and -5 <= metric["percent_change"] <= 5) else "✗"
+                        "Matched": "✓" if matched else "✗"
                     })
                 
                 impact_df = pd.DataFrame(impact_data)
@@ -0,0 +1,39 @@
+"""
+Tests for the single-scan keyword matcher.
+"""
+
+import random
+
+from src.rag.keyword_matcher import KeywordMatcher
+
+def naive_find_all(keywords, text):
+    """Reference implementation: one case-insensitive substring test per keyword."""
+    return {keyword for keyword in keywords if keyword.lower() in text.lower()}
+
+def test_matches_overlapping_and_prefix_keywords():
+    keywords = ["slot", "Slot Track", "track", "sale", "Sale Themes", "theme"]
+    matcher = KeywordMatcher(keywords)
+    
+    text = "Moved the slot track next to the sale themes banner"
+    assert matcher.find_all(text) == naive_find_all(keywords, text)
+    assert matcher.find_all(text) == {"slot", "Slot Track", "track", "sale", "Sale Themes", "theme"}
+
+def test_keeps_every_original_casing():
+    keywords = ["DAU", "dau", "Revenue"]
+    matcher = KeywordMatcher(keywords)
+    
+    assert matcher.find_all("dau dropped") == {"DAU", "dau"}
+    assert len(matcher) == 3
+
+def test_empty_keyword_and_no_keywords():
+    assert KeywordMatcher([""]).find_all("anything") == {""}
+    assert KeywordMatcher([]).find_all("anything") == set()
+
+def test_matches_naive_substring_check_on_random_inputs():
+    rng = random.Random(0)
+    alphabet = "abAB c"
+    
+    for _ in range(500):
+        keywords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(0, 6))]
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        assert KeywordMatcher(keywords).find_all(text) == naive_find_all(keywords, text)
@@ -0,0 +1,82 @@
+"""
+Tests for the vectorized weekly metric trend analysis.
+"""
+
+import math
+import pytest
+
+from src.data.models import LiveOpsChange, MetricMeasurement
+from src.data.sample_generator import generate_sample_data
+from src.rag.analysis.analyzer import ChangeAnalyzer
+from src.rag.domain_knowledge.context import DomainKnowledgeManager
+from src.rag.indexing.indexes import IndexBuilder
+
+def naive_metric_trends(repo, metric_name, weeks):
+    """Reference implementation: group changes into weeks with a plain loop."""
+    ordered = sorted(range(len(repo.changes)), key=lambda i: repo.changes[i].timestamp)
+    
+    weekly_data = {}
+    for i in ordered:
+        change = repo.changes[i]
+        data = weekly_data.setdefault(change.timestamp.strftime("%Y-%U"), [])
+        metric = next((m for m in repo.metrics if m.change_id == change.change_id and m.metric_name == metric_name), None)
+        if metric and not math.isnan(metric.percent_change):
+            data.append((change, metric))
+    
+    trend_analysis = []
+    for week, data in sorted(weekly_data.items(), reverse=True)[:weeks]:
+        if data:
+            percent_changes = [metric.percent_change for _, metric in data]
+            top_change, top_metric = data[percent_changes.index(max(percent_changes))]
+            trend_analysis.append({
+                "week": week,
+                "avg_value": sum(metric.after_value for _, metric in data) / len(data),
+                "avg_percent_change": sum(percent_changes) / len(data),
+                "change_count": len(data),
+                "top_change": {
+                    "category": top_change.category,
+                    "description": top_change.description,
+                    "percent_change": top_metric.percent_change
+                }
+            })
+    return trend_analysis
+
+def assert_same_trends(actual, expected):
+    assert len(actual) == len(expected)
+    for actual_week, expected_week in zip(actual, expected):
+        assert actual_week["week"] == expected_week["week"]
+        assert actual_week["change_count"] == expected_week["change_count"]
+        assert actual_week["avg_value"] == pytest.approx(expected_week["avg_value"])
+        assert actual_week["avg_percent_change"] == pytest.approx(expected_week["avg_percent_change"])
+        assert actual_week["top_change"] == expected_week["top_change"]
+
+def make_analyzer(repo):
+    return ChangeAnalyzer(repo, IndexBuilder(repo), DomainKnowledgeManager())
+
+@pytest.mark.parametrize("metric_name", ["revenue", "dau", "retention"])
+@pytest.mark.parametrize("weeks", [1, 4, 12])
+def test_matches_per_week_loop(metric_name, weeks):
+    repo = generate_sample_data(300, seed=7)
+    
+    result = make_analyzer(repo).analyze_metric_trends(metric_name, weeks)
+    assert_same_trends(result["trend_analysis"], naive_metric_trends(repo, metric_name, weeks))
+
+def test_skips_measurements_without_percent_change():
+    repo = generate_sample_data(200, seed=3)
+    for metric in repo.metrics[::7]:
+        metric.percent_change = float("nan")
+    
+    result = make_analyzer(repo).analyze_metric_trends("session_length", 8)
+    assert_same_trends(result["trend_analysis"], naive_metric_trends(repo, "session_length", 8))
+
+def test_includes_changes_added_after_indexing():
+    repo = generate_sample_data(100, seed=5)
+    analyzer = make_analyzer(repo)
+    
+    latest = max(change.timestamp for change in repo.changes)
+    repo.add_change(LiveOpsChange("late-change", latest, "Sale", "Late sale", {"revenue": "increase"}))
+    repo.add_metric(MetricMeasurement("late-change", "revenue", 100.0, 1000.0))
+    
+    result = analyzer.analyze_metric_trends("revenue", 4)
+    assert_same_trends(result["trend_analysis"], naive_metric_trends(repo, "revenue", 4))
+    assert result["trend_analysis"][0]["top_change"]["description"] == "Late sale"